@@ -0,0 +1,41 @@
+# -*- mode: python ; coding: utf-8 -*-
+
+
+a = Analysis(
+    ['agent.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    # Watch and versus modes only: the model ships as model/model.npz
+    # (numpy_qnet), so torch and the training stack stay out of the build
+    excludes=['torch', 'torchvision', 'matplotlib', 'IPython',
+              'dqn_agent', 'model', 'replay_buffer', 'checkpoint', 'parallel_train', 'snake_vec_env'],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    [],
+    name='SnakeAIPlay',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    runtime_tmpdir=None,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
@@ -1,171 +1,171 @@
-import torch
-import random
-import numpy as np
+import time
+STARTED = time.perf_counter() # before the imports below, for --startup-time
+
 from menu import MainMenu
-from collections import deque
-from snake_game_env import SnakeGameAI, SnakeGameVersus, Direction, Point
-from model import Linear_QNet, QTrainer
-from helper import plot
+from snake_game_env import SnakeGameAI, SnakeGameVersus
+from numpy_qnet import load_play_agent
+from helper import MetricsPlotter
+from profiler import Profiler
+from config import RunConfig, add_config_arguments, config_from_args
 import os
+import signal
+import sys
+import argparse
 
-MAX_MEMORY = 100_000
-BATCH_SIZE = 1000
-LR = 0.001
-
-class Agent:
-    def __init__(self, training_mode=True):
-        self.n_games = 0
-        self.epsilon = 0 
-        self.gamma = 0.9 
-        self.memory = deque(maxlen=MAX_MEMORY) 
-        self.model = Linear_QNet(11, 256, 3) 
-        self.trainer = QTrainer(self.model, lr=LR, gamma=self.gamma)
-        self.training_mode = training_mode
-        self.loaded_record = 0 
-
-        loaded, old_games, old_record = self.model.load() 
-        
-        if loaded:
-            if training_mode:
-                self.n_games = old_games 
-                self.loaded_record = old_record 
-                print(f">>> Continue training from the game: {self.n_games} <<<")
-            else:
-                self.n_games = 0 
-        else:
-            print(">>> New Training... <<<")
-
-    def get_state(self, game):
-        return self._calculate_state(game.head, game.snake, game.food, game.direction, game)
-
-    def get_versus_state(self, game):
-        return self._calculate_state(game.head2, game.snake2, game.food2, game.direction2, game, is_versus=True)
-
-    def _calculate_state(self, head, snake, food, direction, game, is_versus=False):
-        point_l = Point(head.x - 20, head.y)
-        point_r = Point(head.x + 20, head.y)
-        point_u = Point(head.x, head.y - 20)
-        point_d = Point(head.x, head.y + 20)
-        
-        dir_l = direction == Direction.LEFT
-        dir_r = direction == Direction.RIGHT
-        dir_u = direction == Direction.UP
-        dir_d = direction == Direction.DOWN
-
-        if is_versus:
-            check_col = game.is_collision_ai
-        else:
-            check_col = game.is_collision
-
-        state = [
-            (dir_r and check_col(point_r)) or 
-            (dir_l and check_col(point_l)) or 
-            (dir_u and check_col(point_u)) or 
-            (dir_d and check_col(point_d)),
-
-            (dir_u and check_col(point_r)) or 
-            (dir_d and check_col(point_l)) or 
-            (dir_l and check_col(point_u)) or 
-            (dir_r and check_col(point_d)),
-
-            (dir_d and check_col(point_r)) or 
-            (dir_u and check_col(point_l)) or 
-            (dir_r and check_col(point_u)) or 
-            (dir_l and check_col(point_d)),
-            
-            dir_l, dir_r, dir_u, dir_d,
-            food.x < head.x, 
-            food.x > head.x, 
-            food.y < head.y, 
-            food.y > head.y
-        ]
-        return np.array(state, dtype=int)
-
-    def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
-
-    def train_long_memory(self):
-        if len(self.memory) > BATCH_SIZE:
-            mini_sample = random.sample(self.memory, BATCH_SIZE) 
-        else:
-            mini_sample = self.memory
-        states, actions, rewards, next_states, dones = zip(*mini_sample)
-        self.trainer.train_step(states, actions, rewards, next_states, dones)
-
-    def train_short_memory(self, state, action, reward, next_state, done):
-        self.trainer.train_step(state, action, reward, next_state, done)
-
-    def get_action(self, state):
-        if self.training_mode:
-            self.epsilon = 80 - self.n_games
-        else:
-            self.epsilon = 0
-            
-        final_move = [0,0,0]
-        if self.training_mode and random.randint(0, 200) < self.epsilon:
-            move = random.randint(0, 2)
-            final_move[move] = 1
-        else:
-            state0 = torch.tensor(state, dtype=torch.float)
-            prediction = self.model(state0)
-            move = torch.argmax(prediction).item()
-            final_move[move] = 1
-
-        return final_move
-
-def train_ai(mode_choice):
-    agent = Agent(training_mode=True if mode_choice == '2' else False)
-    game = SnakeGameAI()
+# Torch and everything built on it (dqn_agent, snake_vec_env, parallel_train)
+# is imported by the training modes only: the menu, watch and versus modes
+# start without it.
+
+def make_plotter(headless, metrics_file):
+    # Chart window unless headless; CSV log if a file is given
+    if headless and not metrics_file:
+        return None
+    return MetricsPlotter(show=not headless, log_file=metrics_file)
+
+def train_ai(mode_choice, headless=False, render_every=0, prioritized_replay=False, metrics_file=None,
+             keep_checkpoints=3, save_memory=False, replay_file=None,
+             max_games=None, model_dir='./model',
+             profile=False, profile_every=10.0, trace_file=None,
+             target_update=0, tau=0.0, double_dqn=False, record_file=None, seed=None, config=None):
+    # Board size, network and training sizes: see config.RunConfig
+    config = config or RunConfig()
+    if headless:
+        # pygame's SDL swallows SIGTERM; exit through the finally below so the trace,
+        # episode log and last checkpoint get written
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+    if mode_choice == '2':
+        from dqn_agent import Agent
+        agent = Agent(training_mode=True,
+                      prioritized_replay=prioritized_replay, model_dir=model_dir,
+                      keep_checkpoints=keep_checkpoints, save_memory=save_memory, replay_file=replay_file,
+                      target_update=target_update, tau=tau, double_dqn=double_dqn,
+                      seed=seed, config=config)
+        print(f">>> Seed: {agent.seed} <<<")
+    else:
+        # Watch mode: NumPy inference, no trainer
+        agent = load_play_agent(model_dir, seed, config.hidden_size)
+    # The games draw from a stream of their own, derived from the agent's seed
+    game_seed = int(agent.seed_sequence.spawn(1)[0].generate_state(1)[0])
+    game = SnakeGameAI(config.cols, config.rows, headless=headless, render_every=render_every, seed=game_seed,
+                       block_size=config.block_size, speed=config.speed)
+    recorder = None
+    if record_file:
+        # Every game as seed + moves. The log numbers its games itself: a resume
+        # replays the games after the last auto-save, and watch mode starts at 1
+        from recorder import EpisodeRecorder
+        recorder = EpisodeRecorder(record_file)
+        recorder.attach(game)
+        print(f">>> Recording to {record_file} from game {recorder.game} <<<")
     
     record = agent.loaded_record 
+    plotter = make_plotter(headless, metrics_file) if agent.training_mode else None
+    # max_games: stop after that many games in this session (benchmarks)
+    last_game = agent.n_games + max_games if max_games else None
+    # Per-phase timings; every phase is a no-op unless profile is on
+    prof = Profiler(enabled=profile, report_every=profile_every, trace_file=trace_file)
+    if agent.training_mode:
+        agent.trainer.profiler = prof
     
-   
-    plot_scores = [] 
-    plot_mean_scores = []
-    total_score = 0
-    current_session_games = 0 
-    
-    while True:
-        state_old = agent.get_state(game)
-        final_move = agent.get_action(state_old)
-        reward, done, score = game.play_step(final_move)
-        state_new = agent.get_state(game)
+    try:
+        while last_game is None or agent.n_games < last_game:
+            with prof.phase('get_state'):
+                state_old = agent.get_state(game)
+            with prof.phase('get_action'):
+                final_move = agent.get_action(state_old)
+            with prof.phase('play_step'):
+                reward, done, score = game.play_step(final_move)
+            with prof.phase('get_state'):
+                state_new = agent.get_state(game)
 
-        if agent.training_mode:
-            agent.train_short_memory(state_old, final_move, reward, state_new, done)
-            agent.remember(state_old, final_move, reward, state_new, done)
-
-        if done:
-            game.reset()
-            agent.n_games += 1
-            current_session_games += 1 
-            
             if agent.training_mode:
-                agent.train_long_memory()
-                
-                if score > record:
-                    record = score
-                    agent.model.save(n_games=agent.n_games, record=record) 
-                    print(f">>> New record: {record} (Saved) <<<")
-                
-                elif agent.n_games % 10 == 0:
-                    agent.model.save(n_games=agent.n_games, record=record)
-                    print(">>> Auto Save <<<")
+                agent.learn(state_old, final_move, reward, state_new, done)
+            prof.count('steps')
 
-            print(f'Game {agent.n_games} Score {score} Record {record}')
-            
-            if agent.training_mode:
-                plot_scores.append(score)
-                total_score += score
+            if done:
+                if game.won:
+                    print(">>> Board cleared! <<<")
+                game.reset()
+                agent.n_games += 1
+                prof.count('games')
                 
-                mean_score = total_score / current_session_games
+                if agent.training_mode:
+                    with prof.phase('train_long_memory'):
+                        agent.train_long_memory()
+                    
+                    if score > record:
+                        record = score
+                        with prof.phase('checkpoint'):
+                            agent.save(record) 
+                        print(f">>> New record: {record} (Saved) <<<")
+                    
+                    elif agent.n_games % 10 == 0:
+                        with prof.phase('checkpoint'):
+                            agent.save(record)
+                        print(">>> Auto Save <<<")
+
+                print(f'Game {agent.n_games} Score {score} Record {record}')
                 
-                plot_mean_scores.append(mean_score)
-                plot(plot_scores, plot_mean_scores)
+                if plotter:
+                    with prof.phase('plot'):
+                        plotter.push(score)
+            prof.maybe_report()
+    finally:
+        prof.close()
+        if recorder:
+            recorder.close()
+        if agent.training_mode:
+            agent.checkpointer.flush()
+        if plotter:
+            plotter.close()
+
+def train_ai_vec(n_envs, prioritized_replay=False, metrics_file=None, keep_checkpoints=3, save_memory=False,
+                 replay_file=None, target_update=0, tau=0.0, double_dqn=False, seed=None, config=None):
+    # Batched training: n_envs headless boards stepped together in NumPy
+    from dqn_agent import Agent
+    from snake_vec_env import SnakeGameVec
+    # pygame's SDL swallows SIGTERM; exit normally so the pending checkpoint is flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+    agent = Agent(training_mode=True, prioritized_replay=prioritized_replay,
+                  keep_checkpoints=keep_checkpoints, save_memory=save_memory, replay_file=replay_file,
+                  target_update=target_update, tau=tau, double_dqn=double_dqn, seed=seed, config=config)
+    print(f">>> Seed: {agent.seed} <<<")
+    env = SnakeGameVec(n_envs, agent.config.cols, agent.config.rows, seed=agent.seed_sequence.spawn(1)[0])
+    record = agent.loaded_record
+    plotter = make_plotter(True, metrics_file)
+    states = env.get_states()
+
+    while True:
+        actions = agent.get_actions(states)
+        rewards, dones, scores, states_new = env.step(actions)
+        agent.train_short_memory(states, actions, rewards, states_new, dones)
+        agent.memory.extend(states, actions, rewards, states_new, dones)
+        states = states_new
+
+        if dones.any():
+            n_done = int(dones.sum())
+            best = int(scores[dones].max())
+            agent.n_games += n_done
+            agent.train_long_memory()
 
-def play_versus():
-    agent = Agent(training_mode=False) 
-    game = SnakeGameVersus() 
+            if best > record:
+                record = best
+                agent.save(record)
+                print(f">>> New record: {record} (Saved) <<<")
+            elif agent.n_games // 10 != (agent.n_games - n_done) // 10:
+                agent.save(record)
+                print(">>> Auto Save <<<")
+
+            print(f'Game {agent.n_games} Score {best} Record {record}')
+            if plotter:
+                for score in scores[dones]:
+                    plotter.push(int(score))
+
+def play_versus(config=None, seed=None):
+    config = config or RunConfig()
+    agent = load_play_agent(seed=seed, hidden_size=config.hidden_size)
+    # Food placement draws from a stream derived from the agent's seed, as in train_ai
+    game_seed = int(agent.seed_sequence.spawn(1)[0].generate_state(1)[0])
+    game = SnakeGameVersus(config.cols, config.rows, seed=game_seed, block_size=config.block_size)
     
     print("--- STARTING VERSUS MODE ---")
     print("You: Arrow Keys | AI: Auto")
@@ -176,28 +176,134 @@ def play_versus():
         score_human, score_ai = game.play_step(action_ai)
 
 def reset_data():
-    path = './model/model.pth'
-    if os.path.exists(path):
+    folder = './model'
+    names = os.listdir(folder) if os.path.isdir(folder) else []
+    # Checkpoints, replay memory and the NumPy export that watch/versus modes play
+    paths = [os.path.join(folder, name) for name in names
+             if name.startswith('model.pth') or name.startswith('memory.pth') or name == 'model.npz']
+    if paths:
         try:
-            os.remove(path)
+            for path in paths:
+                os.remove(path)
             print(">>> Data cleared! The AI is starting over from zero. <<<")
         except Exception as e:
             print(f"Error can not delete the file: {e}")
     else:
         print(">>> There is no data to delete <<<")
 
+def training_available():
+    # False in the play-only build (SnakeAIPlay.spec), which leaves torch out
+    import importlib.util
+    return importlib.util.find_spec('torch') is not None
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Snake AI')
+    parser.add_argument('--headless', action='store_true',
+                        help='train without a window, event pump or frame limiter')
+    parser.add_argument('--render-every', type=int, default=0,
+                        help='in headless mode, show every N-th game (0 = never)')
+    parser.add_argument('--envs', type=int, default=0,
+                        help='train on N batched boards at once (implies --headless)')
+    parser.add_argument('--prioritized', action='store_true',
+                        help='use prioritized experience replay instead of uniform sampling')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='self-play in N worker processes feeding one learner (implies --headless)')
+    parser.add_argument('--sync-every', type=int, default=10,
+                        help='learner updates between weight broadcasts to the workers')
+    parser.add_argument('--queue-size', type=int, default=64,
+                        help='max transition chunks waiting for the learner')
+    parser.add_argument('--target-update', type=int, default=0,
+                        help='bootstrap from a target network copied every N updates (0 = off)')
+    parser.add_argument('--soft-update', type=float, default=0.0, metavar='TAU',
+                        help='target network Polyak-averaged by TAU after every update instead')
+    parser.add_argument('--double-dqn', action='store_true',
+                        help='online network picks the next action, target network scores it')
+    parser.add_argument('--keep-checkpoints', type=int, default=3,
+                        help='previous checkpoints kept as model.pth.1 ... model.pth.N')
+    parser.add_argument('--save-memory', action='store_true',
+                        help='also checkpoint the replay memory, restored on resume')
+    parser.add_argument('--replay-file', default=None,
+                        help='keep the replay memory in this memory-mapped file (created if missing, '
+                             'resumed if present)')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every phase of the training loop and print periodic summaries')
+    parser.add_argument('--profile-every', type=float, default=10.0,
+                        help='seconds between profile summaries')
+    parser.add_argument('--trace-file', default=None,
+                        help='with --profile, write a Chrome trace (chrome://tracing) here on exit')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed every random stream of the run (default: fresh, printed at start)')
+    parser.add_argument('--record', default=None, metavar='FILE',
+                        help='append every game (seed + moves) to this episode log; '
+                             'inspect or replay it with recorder.py')
+    parser.add_argument('--startup-time', action='store_true',
+                        help='print the time from launch to the first menu frame, then exit')
+    parser.add_argument('--metrics-file', default=None,
+                        help='append per-game metrics (game, score, mean, rolling mean) to this CSV')
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        args.run_config = config_from_args(args)
+    except (OSError, ValueError, TypeError) as e:
+        parser.error(f'bad run configuration: {e}')
+    if args.double_dqn and not (args.target_update or args.soft_update):
+        parser.error('--double-dqn needs --target-update or --soft-update')
+    if args.replay_file and args.prioritized:
+        parser.error('--replay-file and --prioritized cannot be combined')
+    return args
+
 if __name__ == '__main__':
+    args = parse_args()
+    if args.workers > 0:
+        from parallel_train import train_ai_parallel
+        train_ai_parallel(args.workers, sync_every=args.sync_every, queue_size=args.queue_size,
+                          prioritized_replay=args.prioritized, metrics_file=args.metrics_file,
+                          keep_checkpoints=args.keep_checkpoints, save_memory=args.save_memory,
+                          replay_file=args.replay_file, target_update=args.target_update,
+                          tau=args.soft_update, double_dqn=args.double_dqn, seed=args.seed,
+                          config=args.run_config)
+        sys.exit()
+    if args.envs > 0:
+        train_ai_vec(args.envs, prioritized_replay=args.prioritized, metrics_file=args.metrics_file,
+                     keep_checkpoints=args.keep_checkpoints, save_memory=args.save_memory,
+                     replay_file=args.replay_file, target_update=args.target_update,
+                     tau=args.soft_update, double_dqn=args.double_dqn, seed=args.seed,
+                     config=args.run_config)
+        sys.exit()
+    if args.headless:
+        # No menu: the menu itself needs a display
+        train_ai('2', headless=True, render_every=args.render_every,
+                 prioritized_replay=args.prioritized, metrics_file=args.metrics_file,
+                 keep_checkpoints=args.keep_checkpoints, save_memory=args.save_memory,
+                 replay_file=args.replay_file, profile=args.profile,
+                 profile_every=args.profile_every, trace_file=args.trace_file,
+                 target_update=args.target_update, tau=args.soft_update, double_dqn=args.double_dqn,
+                 record_file=args.record, seed=args.seed, config=args.run_config)
+        sys.exit()
+
+    def first_frame():
+        if args.startup_time:
+            print(f">>> First menu frame after {time.perf_counter() - STARTED:.3f}s <<<")
+            sys.exit()
+
     while True:
-        menu = MainMenu()
+        menu = MainMenu(on_first_frame=first_frame)
         choice = menu.run() 
         
       
         if choice == '1':
-            train_ai('1')
+            train_ai('1', record_file=args.record, seed=args.seed, config=args.run_config)
+        elif choice == '2' and not training_available():
+            print(">>> Training needs torch, which this build does not include <<<")
         elif choice == '2':
-            train_ai('2')
+            train_ai('2', prioritized_replay=args.prioritized, metrics_file=args.metrics_file,
+                     keep_checkpoints=args.keep_checkpoints, save_memory=args.save_memory,
+                     replay_file=args.replay_file, profile=args.profile,
+                     profile_every=args.profile_every, trace_file=args.trace_file,
+                     target_update=args.target_update, tau=args.soft_update, double_dqn=args.double_dqn,
+                     record_file=args.record, seed=args.seed, config=args.run_config)
         elif choice == '3':
-            play_versus()
+            play_versus(args.run_config, args.seed)
         elif choice == '4':
            
             print("\n" + "="*30)
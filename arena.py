@@ -0,0 +1,220 @@
+import argparse
+import random
+from collections import deque
+
+import numpy as np
+
+from snake_game_env import Direction, Point, FreeCells
+from state_encoder import empty_grid, grid_stride, cell_index
+
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+STEPS = {Direction.RIGHT: (1, 0), Direction.DOWN: (0, 1), Direction.LEFT: (-1, 0), Direction.UP: (0, -1)}
+
+class ArenaSnake:
+    def __init__(self, body, direction):
+        self.snake = deque(body) # head first, like SnakeGameAI.snake
+        self.head = self.snake[0]
+        self.direction = direction
+        self.score = 0
+        self.alive = True
+        self.frame_iteration = 0 # steps since the start of the match
+        self.game_over_reason = None
+        self.died_at = None # arena frame of the fatal step
+
+# --- ARENA: N snakes, one shared board, stepped in lockstep ---
+# Same rules as SnakeGameAI for each snake (whole old bodies, tails included,
+# are obstacles; more than 100*len(snake) steps since the start is a timeout,
+# the length counting the new head), plus:
+# two heads entering the same cell both die, and every snake is an obstacle
+# for the others. A dead snake leaves the board; the match is over when no
+# snake is alive. Food is shared: n_food items, eaten ones respawn at once.
+# The arena exposes grid/stride/cell like SnakeGameAI, so per-snake states
+# come from Agent._calculate_state, each snake aiming at its nearest food.
+class SnakeArena:
+    def __init__(self, n_snakes, cols=32, rows=24, n_food=None, seed=None):
+        self.n_snakes = n_snakes
+        self.cols = cols
+        self.rows = rows
+        if n_snakes > rows // 2:
+            raise ValueError(f"at most {rows // 2} snakes fit on a {cols}x{rows} board")
+        self.n_food = n_food or n_snakes
+        self.stride = grid_stride(self.cols)
+        self.empty_grid = empty_grid(self.cols, self.rows)
+        self.empty_board = FreeCells(cols, rows)
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.grid = bytearray(self.empty_grid)
+        self.free = self.empty_board.copy()
+        self.snakes = []
+        # One row each, evenly spaced, heading right from the middle
+        x = self.cols // 2
+        for i in range(self.n_snakes):
+            y = (i + 1) * self.rows // (self.n_snakes + 1)
+            body = [Point(x - k, y) for k in range(3)]
+            self.snakes.append(ArenaSnake(body, Direction.RIGHT))
+            for pt in body:
+                self.grid[self.cell(pt)] = 1
+                self.free.remove(pt)
+        self.foods = []
+        for _ in range(self.n_food):
+            self._place_food()
+        self.frame_iteration = 0
+
+    def cell(self, pt):
+        return cell_index(pt.x, pt.y, self.stride)
+
+    def _place_food(self):
+        # A free cell with no food on it yet; False when there is none
+        if len(self.free) <= len(self.foods):
+            return False
+        food = self.free.sample(self.rng)
+        while food in self.foods:
+            food = self.free.sample(self.rng)
+        self.foods.append(food)
+        return True
+
+    def nearest_food(self, head):
+        if not self.foods:
+            return None
+        return min(self.foods, key=lambda f: abs(f.x - head.x) + abs(f.y - head.y))
+
+    @property
+    def alive(self):
+        return [i for i, s in enumerate(self.snakes) if s.alive]
+
+    def is_over(self):
+        return not any(s.alive for s in self.snakes)
+
+    @property
+    def last_alive(self):
+        # Index of the snake that outlived all others, None on a shared last death
+        if not self.is_over():
+            return None
+        last = max(s.died_at for s in self.snakes)
+        survivors = [i for i, s in enumerate(self.snakes) if s.died_at == last]
+        return survivors[0] if len(survivors) == 1 else None
+
+    def get_states(self, agent, snakes=None):
+        # (len(snakes), 11) states of the given (default: living) snakes
+        snakes = self.alive if snakes is None else snakes
+        return np.array([agent._calculate_state(s.head, s.snake, self.nearest_food(s.head), s.direction, self)
+                         for s in (self.snakes[i] for i in snakes)], dtype=int).reshape(-1, 11)
+
+    def play_step(self, actions):
+        # actions: {snake index: [straight, right, left] one-hot} for living snakes.
+        # Returns (rewards, dones, scores), one entry per snake.
+        self.frame_iteration += 1
+        rewards = [0] * self.n_snakes
+        movers = []
+
+        # 1. Every living snake turns and picks its next cell
+        targets = {}
+        for i, action in actions.items():
+            s = self.snakes[i]
+            if not s.alive:
+                continue
+            idx = CLOCK_WISE.index(s.direction)
+            turn = int(np.argmax(action))
+            s.direction = CLOCK_WISE[(idx + (0, 1, -1)[turn]) % 4]
+            dx, dy = STEPS[s.direction]
+            s.head = Point(s.head.x + dx, s.head.y + dy)
+            s.frame_iteration += 1
+            targets[s.head] = targets.get(s.head, 0) + 1
+            movers.append(i)
+
+        # 2. Deaths, all judged on the board as it was before the move
+        dead = []
+        for i in movers:
+            s = self.snakes[i]
+            if self.grid[self.cell(s.head)]:
+                out = s.head.x < 0 or s.head.x >= self.cols or s.head.y < 0 or s.head.y >= self.rows
+                s.game_over_reason = 'wall' if out else 'body'
+            elif targets[s.head] > 1:
+                s.game_over_reason = 'head'
+            elif s.frame_iteration > 100 * (len(s.snake) + 1):
+                s.game_over_reason = 'timeout'
+            else:
+                continue
+            dead.append(i)
+        for i in dead:
+            s = self.snakes[i]
+            s.alive = False
+            s.died_at = self.frame_iteration
+            rewards[i] = -10
+            for pt in s.snake:
+                self.grid[self.cell(pt)] = 0
+                self.free.add(pt)
+
+        # 3. Survivors move; food is eaten and respawned after every snake moved
+        eaten = []
+        for i in movers:
+            s = self.snakes[i]
+            if not s.alive:
+                continue
+            s.snake.appendleft(s.head)
+            self.grid[self.cell(s.head)] = 1
+            self.free.remove(s.head)
+            if s.head in self.foods:
+                self.foods.remove(s.head)
+                eaten.append(i)
+                s.score += 1
+                rewards[i] = 10
+            else:
+                tail = s.snake.pop()
+                self.grid[self.cell(tail)] = 0
+                self.free.add(tail)
+        for _ in eaten:
+            self._place_food()
+
+        dones = [not s.alive for s in self.snakes]
+        return rewards, dones, [s.score for s in self.snakes]
+
+# --- MATCHES: each agent drives its own snakes, one batched call per agent ---
+def play_match(arena, agents, owners, seed=None):
+    # owners[i] is the index in `agents` of the agent driving snake i
+    arena.reset(seed)
+    while not arena.is_over():
+        actions = {}
+        alive = arena.alive
+        for a, agent in enumerate(agents):
+            snakes = [i for i in alive if owners[i] == a]
+            if snakes:
+                moves = agent.get_actions(arena.get_states(agent, snakes))
+                actions.update(zip(snakes, moves))
+        arena.play_step(actions)
+    return [s.score for s in arena.snakes], [s.game_over_reason for s in arena.snakes]
+
+def tournament(agents, names, n_matches=100, snakes_per_agent=1, cols=32, rows=24, seed=0):
+    # Every match puts all agents on one board; seats rotate so no agent keeps the best spot
+    n_snakes = len(agents) * snakes_per_agent
+    arena = SnakeArena(n_snakes, cols, rows)
+    scores = [[] for _ in agents]
+    survived = [0] * len(agents) # times an agent had the last snake standing
+    for match in range(n_matches):
+        owners = [(i + match) % len(agents) for i in range(n_snakes)]
+        match_scores, _ = play_match(arena, agents, owners, seed + match)
+        for i, score in enumerate(match_scores):
+            scores[owners[i]].append(score)
+        if arena.last_alive is not None:
+            survived[owners[arena.last_alive]] += 1
+    for name, agent_scores, wins in sorted(zip(names, scores, survived), key=lambda r: -np.mean(r[1])):
+        print(f"{name:<32} mean {np.mean(agent_scores):6.2f}  max {max(agent_scores):3d}  "
+              f"last standing {wins / n_matches:.0%}")
+
+if __name__ == '__main__':
+    from evaluate import load_net, add_board_arguments, board_config, checkpoint_board
+    from numpy_qnet import NumpyAgent
+    parser = argparse.ArgumentParser(description='Tournament between checkpoints on a shared board')
+    parser.add_argument('checkpoints', nargs='+', help='model.pth checkpoints (or exported .npz files)')
+    parser.add_argument('--matches', type=int, default=100)
+    parser.add_argument('--snakes-per-agent', type=int, default=1)
+    add_board_arguments(parser) # default: the board the first checkpoint was trained on
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    cols, rows = checkpoint_board(args.checkpoints[0], board_config(parser, args), args.cols, args.rows)
+    agents = [NumpyAgent(load_net(path)) for path in args.checkpoints]
+    tournament(agents, args.checkpoints, args.matches, args.snakes_per_agent, cols, rows, args.seed)
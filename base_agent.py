@@ -0,0 +1,64 @@
+import numpy as np
+
+from snake_game_env import DIRECTION_INDEX
+from state_encoder import encode_state
+
+# One-hot moves [straight, right, left], shared read-only rows
+MOVES = np.eye(3, dtype=int)
+MOVES.flags.writeable = False
+
+# --- AGENT BASE: game state -> features -> move ---
+# Everything an agent needs to play, with no model behind it: subclasses
+# provide _predict(states), the greedy move index for each state, and call
+# seed_rng() so exploration draws from the agent's own generator.
+class BaseAgent:
+    n_games = 0
+    epsilon = 0
+    training_mode = False
+    loaded_record = 0
+
+    def seed_rng(self, seed=None):
+        # seed=None draws fresh entropy; self.seed keeps it either way, so a run
+        # can be repeated. seed_sequence.spawn() gives further independent streams.
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self.seed_sequence.entropy
+        self.rng = np.random.default_rng(self.seed_sequence)
+
+    def get_state(self, game):
+        return self._calculate_state(game.head, game.snake, game.food, game.direction, game)
+
+    def get_versus_state(self, game):
+        return self._calculate_state(game.head2, game.snake2, game.food2, game.direction2, game, is_versus=True)
+
+    def _calculate_state(self, head, snake, food, direction, game, is_versus=False):
+        if food is None:
+            food = head # board full, nothing to aim for
+        # Danger flags are lookups in the game's occupancy grid
+        grid = game.grid2 if is_versus else game.grid
+        return encode_state(grid, game.stride, game.cell(head), DIRECTION_INDEX[direction],
+                            food.x - head.x, food.y - head.y)
+
+    def _predict(self, states):
+        raise NotImplementedError
+
+    def get_action(self, state):
+        if self.training_mode:
+            self.epsilon = 80 - self.n_games
+        else:
+            self.epsilon = 0
+            
+        if self.training_mode and self.rng.integers(0, 201) < self.epsilon:
+            move = self.rng.integers(0, 3)
+        else:
+            move = self._predict((state,))[0]
+
+        return MOVES[move]
+
+    def get_actions(self, states):
+        # Batch version of get_action: (N, 11) states -> (N, 3) one-hot moves
+        moves = self._predict(states)
+        if self.training_mode:
+            self.epsilon = 80 - self.n_games
+            explore = self.rng.integers(0, 201, len(moves)) < self.epsilon
+            moves[explore] = self.rng.integers(0, 3, explore.sum())
+        return MOVES[moves]
@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+import torch
+
+from agent import train_ai
+from config import RunConfig
+from dqn_agent import Agent
+from snake_game_env import SnakeGameAI, Point, Direction
+
+BOARDS = ((16, 12), (32, 24), (64, 48)) # cells
+LENGTHS = (3, 100, 1000)
+BATCH_SIZES = (1, 1000)
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+DIRECTIONS = (Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP) # clockwise
+MOVES = ([1, 0, 0], [0, 1, 0], [0, 0, 1]) # straight, right, left
+
+def best_rate(fn, n, repeats):
+    # Best of `repeats` runs of n operations, in operations per second
+    fn(max(1, n // 10)) # warm-up
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(n)
+        best = max(best, n / (time.perf_counter() - start))
+    return best
+
+# --- FIXED-LENGTH SNAKES: the body follows a Hamiltonian cycle forever ---
+# Row 0 left to right, then zig-zag over columns 1.. down to the last row,
+# then back up column 0. Needs an even number of rows.
+def hamiltonian_cycle(cols, rows):
+    cycle = [(x, 0) for x in range(cols)]
+    for y in range(1, rows):
+        xs = range(cols - 1, 0, -1) if y % 2 else range(1, cols)
+        cycle += [(x, y) for x in xs]
+    cycle += [(0, y) for y in range(rows - 1, 0, -1)]
+    return cycle
+
+def _direction(a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    return {(1, 0): 0, (0, 1): 1, (-1, 0): 2, (0, -1): 3}[(dx, dy)]
+
+def lay_snake(game, length):
+    # Put a snake of `length` cells on the cycle, food out of reach so it never
+    # grows; returns the relative moves that keep it on the cycle
+    cycle = hamiltonian_cycle(game.cols, game.rows)
+    n = len(cycle)
+    points = [Point(x, y) for x, y in cycle]
+    game.reset()
+    game.snake = deque(reversed(points[:length]))
+    game.head = game.snake[0]
+    game.grid = bytearray(game.empty_grid)
+    game.free = game.empty_board.copy()
+    for pt in game.snake:
+        game.grid[game.cell(pt)] = 1
+        game.free.remove(pt)
+    game.direction = DIRECTIONS[_direction(cycle[length - 2], cycle[length - 1])]
+    game.food = Point(-1, -1)
+
+    moves = []
+    for i in range(n):
+        entering = _direction(cycle[i - 1], cycle[i])
+        leaving = _direction(cycle[i], cycle[(i + 1) % n])
+        moves.append(MOVES[(0, 1, None, 2)[(leaving - entering) % 4]])
+    return moves, (length - 1) % n
+
+def bench_play_step(cols, rows, length, n, repeats, seed):
+    game = SnakeGameAI(cols, rows, headless=True, seed=seed)
+    moves, head_pos = lay_snake(game, length)
+    state = {'pos': head_pos}
+
+    def run(k):
+        pos = state['pos']
+        n_moves = len(moves)
+        for _ in range(k):
+            game.frame_iteration = 0 # no timeout
+            game.play_step(moves[pos])
+            pos = (pos + 1) % n_moves
+        state['pos'] = pos
+    return best_rate(run, n, repeats)
+
+def bench_encode(agent, cols, rows, length, n, repeats, seed):
+    game = SnakeGameAI(cols, rows, headless=True, seed=seed)
+    lay_snake(game, length)
+    game.food = game.free.sample(game.rng)
+
+    def run(k):
+        for _ in range(k):
+            agent.get_state(game)
+    return best_rate(run, n, repeats)
+
+def bench_train_step(agent, batch_size, n, repeats):
+    rng = np.random.default_rng(0)
+    states = rng.integers(0, 2, (batch_size, 11)).astype(np.uint8)
+    actions = np.eye(3, dtype=np.uint8)[rng.integers(0, 3, batch_size)]
+    rewards = rng.choice(np.array([0, 10, -10], dtype=np.float32), batch_size)
+    next_states = rng.integers(0, 2, (batch_size, 11)).astype(np.uint8)
+    dones = rng.random(batch_size) < 0.05
+    if batch_size == 1:
+        # The per-step path: one unbatched transition, as train_short_memory sends it
+        sample = (states[0], actions[0], float(rewards[0]), next_states[0], bool(dones[0]))
+    else:
+        sample = tuple(torch.from_numpy(x) for x in (states, actions, rewards, next_states, dones))
+
+    def run(k):
+        for _ in range(k):
+            agent.trainer.train_step(*sample)
+    return best_rate(run, n, repeats)
+
+def bench_train_ai(cols, rows, n_games, seed):
+    with tempfile.TemporaryDirectory() as model_dir, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        train_ai('2', headless=True, max_games=n_games, model_dir=model_dir, seed=seed,
+                 config=RunConfig(cols=cols, rows=rows))
+        elapsed = time.perf_counter() - start
+    return n_games / elapsed * 3600
+
+def run_benchmarks(seed=0, quick=False):
+    scale = 0.1 if quick else 1.0
+    repeats = 2 if quick else 3
+    results = {}
+
+    def record(name, value, unit):
+        results[name] = {'value': round(value, 2), 'unit': unit}
+        print(f'{name:<40} {value:>14,.1f} {unit}')
+
+    for cols, rows in BOARDS:
+        for length in LENGTHS:
+            if length >= cols * rows // 2:
+                continue
+            record(f'play_step/{cols}x{rows}/len{length}',
+                   bench_play_step(cols, rows, length, int(50_000 * scale), repeats, seed), 'steps/s')
+
+    agent = Agent(training_mode=False, load_model=False, seed=seed)
+    for cols, rows in BOARDS:
+        for length in LENGTHS:
+            if length >= cols * rows // 2:
+                continue
+            record(f'calculate_state/{cols}x{rows}/len{length}',
+                   bench_encode(agent, cols, rows, length, int(100_000 * scale), repeats, seed), 'states/s')
+
+    for batch_size in BATCH_SIZES:
+        agent = Agent(training_mode=True, load_model=False, seed=seed)
+        n = int((2000 if batch_size == 1 else 200) * scale)
+        record(f'train_step/batch{batch_size}',
+               bench_train_step(agent, batch_size, n, repeats), 'updates/s')
+
+    for cols, rows in BOARDS:
+        record(f'train_ai/{cols}x{rows}',
+               bench_train_ai(cols, rows, max(10, int(100 * scale)), seed), 'games/h')
+    return results
+
+def compare(results, baseline, tolerance):
+    # Higher is better everywhere; returns the names that got slower than tolerance allows
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, entry in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]['value']
+        new = entry['value']
+        change = new / old - 1 if old else 0.0
+        flag = ''
+        if change < -tolerance:
+            regressions.append(name)
+            flag = '  <-- REGRESSION'
+        print(f'{name:<40} {old:>14,.1f} {new:>14,.1f} {change:>+8.1%}{flag}')
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Snake AI benchmarks (headless, fixed seed)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--threads', type=int, default=1,
+                        help='torch CPU threads; keep it fixed when comparing runs')
+    parser.add_argument('--quick', action='store_true', help='10x fewer iterations')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed slowdown against the baseline before failing (0.10 = 10%%)')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    torch.set_num_threads(args.threads)
+    report = {
+        'meta': {
+            'seed': args.seed,
+            'quick': args.quick,
+            'threads': args.threads,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'torch': torch.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': run_benchmarks(args.seed, args.quick),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n>>> Results written to {args.output} <<<")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f">>> Baseline saved to {args.baseline} <<<")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('quick') != args.quick or baseline['meta'].get('threads') != args.threads:
+            print(">>> Warning: baseline was recorded with different --quick/--threads settings <<<")
+        regressions = compare(report['results'], baseline['results'], args.tolerance)
+        if regressions:
+            print(f">>> {len(regressions)} benchmark(s) slower than the baseline <<<")
+            sys.exit(1)
+        print(">>> No regressions <<<")
+    else:
+        print(f">>> No baseline at {args.baseline}, run with --save-baseline to create one <<<")
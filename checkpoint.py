@@ -0,0 +1,148 @@
+import atexit
+import copy
+import os
+import queue
+import shutil
+import threading
+
+import torch
+
+def atomic_save(obj, path):
+    # Write to a temp file next to the target, then rename over it: a crash
+    # mid-write leaves the previous checkpoint untouched
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        torch.save(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# --- CHECKPOINTER: snapshots on the training thread, writes in the background ---
+# model.pth is always the latest checkpoint; model.pth.1 ... model.pth.<keep>
+# are the previous ones, newest first. The replay memory goes to memory.pth,
+# the play-only NumPy export (see numpy_qnet) to model.npz.
+class Checkpointer:
+    def __init__(self, folder='./model', file_name='model.pth', keep=3,
+                 save_optimizer=True, save_memory=False):
+        self.path = os.path.join(folder, file_name)
+        self.memory_path = os.path.join(folder, 'memory.pth')
+        self.export_path = os.path.join(folder, 'model.npz')
+        self.keep = keep
+        self.save_optimizer = save_optimizer
+        self.save_memory = save_memory
+        # One pending snapshot at most: a newer one replaces it
+        self.pending = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)
+
+    def save(self, agent, record):
+        checkpoint = {
+            'model_state': {k: v.detach().clone() for k, v in agent.model.state_dict().items()},
+            'n_games': agent.n_games,
+            'record': record,
+            'seed': agent.seed,
+            'rng_state': agent.rng.bit_generator.state,
+            'config': agent.config.to_dict(),
+        }
+        if self.save_optimizer:
+            checkpoint['optimizer_state'] = copy.deepcopy(agent.trainer.optimizer.state_dict())
+        target_model = agent.trainer.target_model
+        if target_model is not None:
+            checkpoint['target_state'] = {k: v.detach().clone() for k, v in target_model.state_dict().items()}
+        memory = agent.memory.state_dict() if self.save_memory else None
+        # A --replay-file buffer is pushed to disk (msync) by the writer too
+        sync = agent.memory.flush if agent.replay_file else None
+
+        try:
+            self.pending.put_nowait((checkpoint, memory, sync))
+        except queue.Full:
+            try:
+                self.pending.get_nowait()
+                self.pending.task_done()
+            except queue.Empty:
+                pass
+            self.pending.put_nowait((checkpoint, memory, sync))
+
+    def flush(self):
+        self.pending.join()
+
+    def _run(self):
+        from numpy_qnet import export_state_dict
+        while True:
+            checkpoint, memory, sync = self.pending.get()
+            try:
+                self._rotate()
+                atomic_save(checkpoint, self.path)
+                export_state_dict(checkpoint['model_state'], self.export_path)
+                if memory is not None:
+                    atomic_save(memory, self.memory_path)
+                if sync is not None:
+                    sync()
+            except Exception as e:
+                # Keep the writer alive: a dead thread would hang flush() at exit
+                print(f">>> Checkpoint could not be written: {e} <<<")
+            finally:
+                self.pending.task_done()
+
+    def _rotate(self):
+        if self.keep <= 0 or not os.path.exists(self.path):
+            return
+        for i in range(self.keep - 1, 0, -1):
+            older = f'{self.path}.{i}'
+            if os.path.exists(older):
+                os.replace(older, f'{self.path}.{i + 1}')
+        # Copy, not move: model.pth must exist at every moment
+        shutil.copyfile(self.path, f'{self.path}.1')
+
+    def paths(self):
+        return [self.path] + [f'{self.path}.{i}' for i in range(1, self.keep + 1)]
+
+    def load(self, agent, load_training_state=True):
+        # Newest readable checkpoint wins; returns (loaded, n_games, record)
+        for path in self.paths():
+            if not os.path.exists(path):
+                continue
+            try:
+                checkpoint = torch.load(path)
+            except Exception as e:
+                print(f">>> Skipping unreadable checkpoint {path} ({type(e).__name__}) <<<")
+                continue
+
+            if not (isinstance(checkpoint, dict) and 'model_state' in checkpoint):
+                agent.model.load_state_dict(checkpoint)
+                agent.model.eval()
+                agent.trainer.sync_target()
+                print(">>> The system has been reset to factory settings, back to square one. <<<")
+                return True, 0, 0
+
+            try:
+                agent.model.load_state_dict(checkpoint['model_state'])
+            except RuntimeError:
+                saved = checkpoint.get('config', {}).get('hidden_size', '?')
+                raise ValueError(f"{path} holds a network with {saved} hidden units, this run asks for "
+                                 f"{agent.config.hidden_size}: use the same --hidden-size or reset the data") from None
+            agent.model.eval()
+            agent.trainer.sync_target()
+            n_games = checkpoint.get('n_games', 0)
+            record = checkpoint.get('record', 0)
+            print(f">>> The old game has been re-downloaded.! (Game number : {n_games}, Record: {record}) <<<")
+
+            if load_training_state:
+                if 'optimizer_state' in checkpoint:
+                    agent.trainer.optimizer.load_state_dict(checkpoint['optimizer_state'])
+                    print(">>> Optimizer state restored <<<")
+                if 'target_state' in checkpoint and agent.trainer.target_model is not None:
+                    agent.trainer.target_model.load_state_dict(checkpoint['target_state'])
+                if 'rng_state' in checkpoint and not agent.fixed_seed:
+                    agent.restore_seed(checkpoint['seed'], checkpoint['rng_state'])
+                # Only into a run that checkpoints its memory: a --replay-file buffer
+                # is its own checkpoint and must not be reset to an older memory.pth
+                if self.save_memory and os.path.exists(self.memory_path):
+                    agent.memory.load_state_dict(torch.load(self.memory_path))
+                    print(f">>> Replay memory restored ({len(agent.memory)} transitions) <<<")
+            return True, n_games, record
+
+        print(">>> Do not find old data. Create new one<<<")
+        return False, 0, 0
@@ -0,0 +1,88 @@
+import json
+
+# --- RUN CONFIGURATION: board, network and training sizes in one place ---
+# Built from DEFAULTS, then a JSON file with any subset of the keys
+# (--config), then command-line flags. Saved in every checkpoint.
+DEFAULTS = {
+    # Board, in cells
+    'cols': 32,
+    'rows': 24,
+    # Window only: pixels per cell, frames per second while training on screen
+    'block_size': 20,
+    'speed': 80,
+    # Network and optimiser
+    'hidden_size': 256,
+    'lr': 0.001,
+    'gamma': 0.9,
+    # Replay memory
+    'batch_size': 1000,
+    'memory_size': 100_000,
+    'disk_memory_size': 10_000_000, # capacity of a new --replay-file (~30 bytes each)
+    # Update schedule (see dqn_agent.UpdateSchedule)
+    'train_every': 1,
+    'replay_ratio': 0.0,
+    'replay_batch': None, # None: batch_size
+}
+
+class RunConfig:
+    def __init__(self, **values):
+        unknown = sorted(set(values) - set(DEFAULTS))
+        if unknown:
+            raise ValueError(f"unknown config keys: {', '.join(unknown)}")
+        for key, default in DEFAULTS.items():
+            setattr(self, key, values.get(key, default))
+        if self.cols < 4 or self.rows < 1:
+            raise ValueError(f"a {self.cols}x{self.rows} board is too small: the snake starts 3 cells long "
+                             f"from the middle column")
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in DEFAULTS}
+
+    def updated(self, **values):
+        # A copy with the given values replaced; None means "not given"
+        return RunConfig(**{**self.to_dict(), **{k: v for k, v in values.items() if v is not None}})
+
+    def __repr__(self):
+        return f"RunConfig({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+    @property
+    def board(self):
+        return f"{self.cols}x{self.rows}"
+
+def add_config_arguments(parser):
+    # Flags default to None so they only override what they are given for
+    group = parser.add_argument_group('run configuration (defaults in config.py)')
+    group.add_argument('--config', default=None, help='JSON file with any of the keys in config.DEFAULTS')
+    group.add_argument('--cols', type=int, default=None, help='board width in cells (default 32)')
+    group.add_argument('--rows', type=int, default=None, help='board height in cells (default 24)')
+    group.add_argument('--block-size', type=int, default=None, help='pixels per cell on screen (default 20)')
+    group.add_argument('--speed', type=int, default=None, help='frames per second on screen (default 80)')
+    group.add_argument('--hidden-size', type=int, default=None, help='hidden layer width (default 256)')
+    group.add_argument('--lr', type=float, default=None, help='learning rate (default 0.001)')
+    group.add_argument('--gamma', type=float, default=None, help='discount factor (default 0.9)')
+    group.add_argument('--batch-size', type=int, default=None,
+                       help='long-memory batch size at the end of every game (default 1000)')
+    group.add_argument('--memory-size', type=int, default=None, help='replay memory capacity (default 100000)')
+    group.add_argument('--train-every', type=int, default=None,
+                       help='one short-memory update every K steps, on the last K transitions (default 1)')
+    group.add_argument('--replay-ratio', type=float, default=None,
+                       help='extra replay-memory updates per transition, e.g. 0.25 (default 0)')
+    group.add_argument('--replay-batch', type=int, default=None,
+                       help='batch size of those replay updates (default: --batch-size)')
+
+def config_from_args(args):
+    config = RunConfig.load(args.config) if args.config else RunConfig()
+    return config.updated(cols=args.cols, rows=args.rows, block_size=args.block_size, speed=args.speed,
+                          hidden_size=args.hidden_size, lr=args.lr, gamma=args.gamma,
+                          batch_size=args.batch_size, memory_size=args.memory_size,
+                          train_every=args.train_every, replay_ratio=args.replay_ratio,
+                          replay_batch=args.replay_batch)
@@ -0,0 +1,140 @@
+import torch
+import numpy as np
+from base_agent import BaseAgent
+from model import Linear_QNet, QTrainer
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer, MmapReplayBuffer
+from checkpoint import Checkpointer
+from config import RunConfig, DEFAULTS
+
+# --- UPDATE SCHEDULE: how many gradient steps each environment step buys ---
+# train_every=K: the short-memory update runs once every K steps, on a batch
+#   of the last K transitions (K=1 is the classic one-sample update per frame)
+# replay_ratio=R: R extra replay-memory updates of replay_batch samples per
+#   transition, fractions carried over (0 = only the end-of-game update)
+class UpdateSchedule:
+    def __init__(self, train_every=1, replay_ratio=0.0, replay_batch=DEFAULTS['batch_size']):
+        self.train_every = train_every
+        self.replay_ratio = replay_ratio
+        self.replay_batch = replay_batch
+        self.steps = 0
+        self.credit = 0.0
+
+    def step(self):
+        # Returns (short-memory update due?, number of replay updates due)
+        self.steps += 1
+        self.credit += self.replay_ratio
+        n_replay = int(self.credit)
+        self.credit -= n_replay
+        return self.steps % self.train_every == 0, n_replay
+
+class Agent(BaseAgent):
+    def __init__(self, training_mode=True, prioritized_replay=False, load_model=True,
+                 model_dir='./model', keep_checkpoints=3, save_memory=False, replay_file=None,
+                 schedule=None, target_update=0, tau=0.0, double_dqn=False, seed=None, config=None):
+        # Sizes, learning rate and schedule come from the run configuration
+        self.config = config = config or RunConfig()
+        self.n_games = 0
+        self.epsilon = 0 
+        self.gamma = config.gamma
+        self.prioritized_replay = prioritized_replay
+        self.replay_file = replay_file
+        # One seed drives exploration, replay sampling and the initial weights;
+        # an explicit seed wins over the one saved in a resumed checkpoint
+        self.seed_rng(seed)
+        self.fixed_seed = seed is not None
+        memory_seed, torch_seed = self.seed_sequence.spawn(2)
+        if replay_file:
+            if prioritized_replay:
+                raise ValueError("prioritized replay needs the in-memory buffer")
+            # Persistent memory: it is its own checkpoint
+            self.memory = MmapReplayBuffer(replay_file, config.disk_memory_size, seed=memory_seed)
+            save_memory = False
+            print(f">>> Replay memory on disk: {replay_file} ({len(self.memory)} transitions) <<<")
+        elif prioritized_replay:
+            self.memory = PrioritizedReplayBuffer(config.memory_size, seed=memory_seed)
+        else:
+            self.memory = ReplayBuffer(config.memory_size, seed=memory_seed)
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(int(torch_seed.generate_state(1)[0]))
+            self.model = Linear_QNet(11, config.hidden_size, 3)
+        self.trainer = QTrainer(self.model, lr=config.lr, gamma=self.gamma,
+                                target_update=target_update, tau=tau, double_dqn=double_dqn)
+        self.training_mode = training_mode
+        self.schedule = schedule or UpdateSchedule(config.train_every, config.replay_ratio,
+                                                   config.replay_batch or config.batch_size)
+        self.loaded_record = 0 
+        # Reused float32 input for inference, grown on demand
+        self._input = np.empty((1, 11), dtype=np.float32)
+        self._input_tensor = torch.from_numpy(self._input)
+
+        self.checkpointer = Checkpointer(model_dir, keep=keep_checkpoints, save_memory=save_memory)
+
+        if not load_model:
+            return
+        loaded, old_games, old_record = self.checkpointer.load(self, load_training_state=training_mode) 
+        
+        if loaded:
+            if training_mode:
+                self.n_games = old_games 
+                self.loaded_record = old_record 
+                print(f">>> Continue training from the game: {self.n_games} <<<")
+            else:
+                self.n_games = 0 
+        else:
+            print(">>> New Training... <<<")
+
+    def restore_seed(self, seed, rng_state):
+        # Resuming a run: its seed drives every derived stream again (replay
+        # sampling here; games, boards and workers are derived after loading),
+        # and exploration continues from the saved generator state
+        self.seed_rng(seed)
+        memory_seed, _ = self.seed_sequence.spawn(2)
+        self.memory.rng = np.random.default_rng(memory_seed)
+        self.rng.bit_generator.state = rng_state
+
+    def save(self, record):
+        # Snapshot now, written to disk (and a --replay-file synced) in the background
+        self.checkpointer.save(self, record)
+
+    def remember(self, state, action, reward, next_state, done):
+        self.memory.append(state, action, reward, next_state, done)
+
+    def learn(self, state, action, reward, next_state, done):
+        # Store the transition, then run the updates the schedule asks for
+        prof = self.trainer.profiler
+        with prof.phase('remember'):
+            self.remember(state, action, reward, next_state, done)
+        short_due, n_replay = self.schedule.step()
+        if short_due:
+            with prof.phase('train_short_memory'):
+                if self.schedule.train_every == 1:
+                    self.train_short_memory(state, action, reward, next_state, done)
+                else:
+                    self.trainer.train_step(*self.memory.recent(self.schedule.train_every))
+        for _ in range(n_replay):
+            with prof.phase('train_replay'):
+                self.train_long_memory(self.schedule.replay_batch)
+
+    def train_long_memory(self, batch_size=None):
+        batch_size = batch_size or self.config.batch_size
+        if self.prioritized_replay:
+            states, actions, rewards, next_states, dones, weights, idx = self.memory.sample(batch_size)
+            td_errors = self.trainer.train_step(states, actions, rewards, next_states, dones, weights)
+            self.memory.update_priorities(idx, td_errors)
+        else:
+            states, actions, rewards, next_states, dones = self.memory.sample(batch_size)
+            self.trainer.train_step(states, actions, rewards, next_states, dones)
+
+    def train_short_memory(self, state, action, reward, next_state, done):
+        self.trainer.train_step(state, action, reward, next_state, done)
+
+    def _predict(self, states):
+        # Greedy move index for each state, one forward pass, no autograd
+        n = len(states)
+        if n > len(self._input):
+            self._input = np.empty((n, 11), dtype=np.float32)
+            self._input_tensor = torch.from_numpy(self._input)
+        self._input[:n] = states
+        with torch.inference_mode():
+            prediction = self.model(self._input_tensor[:n])
+            return torch.argmax(prediction, dim=1).numpy()
@@ -0,0 +1,136 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import signal
+import time
+
+import numpy as np
+
+from config import RunConfig
+from numpy_qnet import NumpyQNet, NumpyAgent, load_model_state, load_run_config
+from snake_game_env import SnakeGameAI
+
+REASONS = ('wall', 'body', 'timeout', 'win')
+CHUNK_GAMES = 50 # games per task handed to a worker
+
+# --- EVALUATION: greedy games, fixed seeds, many processes ---
+# Game i is always played with seed + i, whatever the number of workers, so
+# two checkpoints evaluated with the same seed face the same food sequences
+# as long as they make the same moves. Moves come from the NumPy engine
+# (numpy_qnet), which picks exactly what the torch model would.
+def load_net(path):
+    if path.endswith('.npz'):
+        return NumpyQNet.load(path)
+    return NumpyQNet.from_state_dict(load_model_state(path))
+
+def checkpoint_board(path, config=None, cols=None, rows=None):
+    # cols/rows if given, else the config's board, else the one the checkpoint was trained on
+    config = (config or load_run_config(path) or RunConfig()).updated(cols=cols, rows=rows)
+    return config.cols, config.rows
+
+def _init_worker():
+    # Undo SDL's SIGTERM handler so Pool.terminate() stops the workers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def _play_games(task):
+    net, cols, rows, seeds = task
+    agent = NumpyAgent(net)
+    game = SnakeGameAI(cols, rows, headless=True)
+    results = []
+    for seed in seeds:
+        game.reset(seed)
+        steps = 0
+        done = False
+        while not done:
+            _, done, score = game.play_step(agent.get_action(agent.get_state(game)))
+            steps += 1
+        results.append((seed, score, game.game_over_reason, steps))
+    return results
+
+def evaluate(path, n_games=1000, workers=None, seed=0, cols=None, rows=None, pool=None, config=None):
+    cols, rows = checkpoint_board(path, config, cols, rows)
+    net = load_net(path)
+    seeds = list(range(seed, seed + n_games))
+    tasks = [(net, cols, rows, seeds[i:i + CHUNK_GAMES]) for i in range(0, n_games, CHUNK_GAMES)]
+    start = time.perf_counter()
+    if pool is None:
+        with mp.get_context('spawn').Pool(workers or os.cpu_count(), _init_worker) as pool:
+            chunks = pool.map(_play_games, tasks)
+    else:
+        chunks = pool.map(_play_games, tasks)
+    elapsed = time.perf_counter() - start
+
+    results = sorted(r for chunk in chunks for r in chunk)
+    scores = np.array([score for _, score, _, _ in results])
+    steps = np.array([n for _, _, _, n in results])
+    reasons = [reason for _, _, reason, _ in results]
+    p5, p25, p50, p75, p95 = np.percentile(scores, (5, 25, 50, 75, 95))
+    return {
+        'checkpoint': path,
+        'games': n_games,
+        'seed': seed,
+        'board': f'{cols}x{rows}',
+        'mean': float(scores.mean()),
+        'std': float(scores.std()),
+        'p5': float(p5), 'p25': float(p25), 'median': float(p50), 'p75': float(p75), 'p95': float(p95),
+        'min': int(scores.min()),
+        'max': int(scores.max()),
+        'mean_steps': float(steps.mean()),
+        'causes': {reason: reasons.count(reason) / n_games for reason in REASONS},
+        'timeout_rate': reasons.count('timeout') / n_games,
+        'seconds': elapsed,
+        'scores': scores.tolist(),
+    }
+
+def print_report(report):
+    causes = ', '.join(f"{reason} {share:.1%}" for reason, share in report['causes'].items())
+    print(f">>> {report['checkpoint']}: {report['games']} games on {report['board']} "
+          f"in {report['seconds']:.1f}s (seed {report['seed']}) <<<")
+    print(f"    mean {report['mean']:.2f} +- {report['std']:.2f} | "
+          f"p5 {report['p5']:.0f}  p25 {report['p25']:.0f}  median {report['median']:.0f}  "
+          f"p75 {report['p75']:.0f}  p95 {report['p95']:.0f}  max {report['max']}")
+    print(f"    game over: {causes} | mean length {report['mean_steps']:.0f} steps")
+
+def add_board_arguments(parser):
+    # Default board: the one each checkpoint was trained on (config.DEFAULTS for .npz files)
+    parser.add_argument('--config', default=None, help='JSON run configuration to take the board from')
+    parser.add_argument('--cols', type=int, default=None, help='board width in cells (default: from the checkpoint)')
+    parser.add_argument('--rows', type=int, default=None, help='board height in cells (default: from the checkpoint)')
+
+def board_config(parser, args):
+    try:
+        return RunConfig.load(args.config) if args.config else None
+    except (OSError, ValueError, TypeError) as e:
+        parser.error(f'bad run configuration: {e}')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Score checkpoints with headless greedy games')
+    parser.add_argument('checkpoints', nargs='*', default=['./model/model.pth'],
+                        help='model.pth checkpoints (or exported .npz files)')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help='default: one per CPU')
+    parser.add_argument('--seed', type=int, default=0, help='game i uses seed + i')
+    add_board_arguments(parser)
+    parser.add_argument('--json', default=None, help='also write all reports to this file')
+    args = parser.parse_args(argv)
+    args.run_config = board_config(parser, args)
+    return args
+
+if __name__ == '__main__':
+    args = parse_args()
+    reports = []
+    with mp.get_context('spawn').Pool(args.workers or os.cpu_count(), _init_worker) as pool:
+        for path in args.checkpoints:
+            report = evaluate(path, args.games, seed=args.seed, cols=args.cols, rows=args.rows, pool=pool,
+                              config=args.run_config)
+            print_report(report)
+            reports.append(report)
+
+    if len(reports) > 1:
+        best = max(reports, key=lambda r: r['mean'])
+        print(f">>> Best mean score: {best['checkpoint']} ({best['mean']:.2f}) <<<")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+        print(f">>> Reports written to {args.json} <<<")
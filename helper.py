@@ -1,20 +1,102 @@
-import matplotlib.pyplot as plt
-from IPython import display
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
 
-plt.ion()
-
-def plot(scores, mean_scores):
-    display.clear_output(wait=True)
-    display.display(plt.gcf())
+def plot(games, scores, mean_scores, rolling_scores, window):
+    import matplotlib.pyplot as plt
     plt.clf()
-    plt.title('Training Progress')  
+    plt.title('Training Progress')
     plt.xlabel('Number of Games')
     plt.ylabel('Score')
-    plt.plot(scores, label='Score')
-    plt.plot(mean_scores, label='Average Score')
+    plt.plot(games, scores, label='Score')
+    plt.plot(games, mean_scores, label='Average Score')
+    plt.plot(games, rolling_scores, label=f'Average of last {window}')
     plt.legend(loc='upper left')
     plt.ylim(ymin=0)
-    plt.text(len(scores)-1, scores[-1], str(scores[-1]))
-    plt.text(len(mean_scores)-1, mean_scores[-1], str(mean_scores[-1]))
+    plt.text(games[-1], scores[-1], str(scores[-1]))
+    plt.text(games[-1], mean_scores[-1], str(round(mean_scores[-1], 2)))
     plt.show(block=False)
-    plt.pause(.1)
\ No newline at end of file
+
+# --- TRAINING METRICS: aggregated and drawn in a separate process ---
+# The training loop only drops scores into a queue and never waits: the
+# metrics process keeps a rolling mean and a downsampled history, redraws
+# at a fixed rate and/or appends every game to a CSV file.
+class MetricsPlotter:
+    def __init__(self, show=True, log_file=None, window=100, max_points=1000, redraw_every=1.0):
+        ctx = mp.get_context('spawn')
+        self.queue = ctx.Queue(maxsize=10_000)
+        self.process = ctx.Process(target=_metrics_loop, daemon=True,
+                                   args=(self.queue, show, log_file, window, max_points, redraw_every))
+        self.process.start()
+
+    def push(self, score):
+        try:
+            self.queue.put_nowait(score)
+        except queue.Full:
+            pass # never block training for a chart
+
+    def close(self):
+        self.queue.put(None)
+        self.process.join(timeout=5)
+
+def _metrics_loop(scores_in, show, log_file, window, max_points, redraw_every):
+    if show:
+        import matplotlib.pyplot as plt
+        plt.ion()
+    log = open(log_file, 'a') if log_file else None
+
+    n_games = 0
+    total_score = 0
+    recent = deque(maxlen=window)
+    # History keeps one point every `stride` games; halved when it gets too long
+    stride = 1
+    games, scores, mean_scores, rolling_scores = [], [], [], []
+    last_draw = 0.0
+    changed = False
+    running = True
+
+    while running:
+        batch = []
+        try:
+            batch.append(scores_in.get(timeout=0.1))
+            while True:
+                batch.append(scores_in.get_nowait())
+        except queue.Empty:
+            pass
+
+        for score in batch:
+            if score is None:
+                running = False
+                break
+            n_games += 1
+            total_score += score
+            recent.append(score)
+            mean_score = total_score / n_games
+            rolling = sum(recent) / len(recent)
+            changed = True
+            if log:
+                log.write(f'{n_games},{score},{mean_score:.4f},{rolling:.4f}\n')
+            if n_games % stride == 0:
+                games.append(n_games)
+                scores.append(score)
+                mean_scores.append(mean_score)
+                rolling_scores.append(rolling)
+                if len(games) > max_points:
+                    stride *= 2
+                    games, scores = games[1::2], scores[1::2]
+                    mean_scores, rolling_scores = mean_scores[1::2], rolling_scores[1::2]
+
+        now = time.monotonic()
+        if changed and (now - last_draw >= redraw_every or not running):
+            last_draw = now
+            changed = False
+            if log:
+                log.flush()
+            if show and games:
+                plot(games, scores, mean_scores, rolling_scores, window)
+        if show:
+            plt.pause(0.01)
+
+    if log:
+        log.close()
\ No newline at end of file
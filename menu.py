@@ -45,11 +45,12 @@ class Button:
         return False
 
 class MainMenu:
-    def __init__(self):
+    def __init__(self, on_first_frame=None):
         self.width = 640
         self.height = 480
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption('Snake AI - Main Menu')
+        self.on_first_frame = on_first_frame # startup timing hook
         self.font_title = pygame.font.SysFont('arial', 50, bold=True)
         
         # Tạo danh sách các nút (Căn giữa màn hình)
@@ -85,4 +86,7 @@ class MainMenu:
             for btn in self.buttons:
                 btn.draw(self.screen)
 
-            pygame.display.flip()
\ No newline at end of file
+            pygame.display.flip()
+            if self.on_first_frame:
+                callback, self.on_first_frame = self.on_first_frame, None
+                callback()
\ No newline at end of file
@@ -1,8 +1,12 @@
+import copy
 import torch
 import torch.nn as nn
 import torch.optim as optim
 import torch.nn.functional as F
+import numpy as np
 import os
+from checkpoint import atomic_save
+from profiler import NULL_PROFILER
 
 class Linear_QNet(nn.Module):
     def __init__(self, input_size, hidden_size, output_size):
@@ -25,7 +29,7 @@ class Linear_QNet(nn.Module):
             'n_games': n_games,
             'record': record
         }
-        torch.save(checkpoint, file_name)
+        atomic_save(checkpoint, file_name)
     def load(self, file_name='model.pth'):
         model_folder_path = './model'
         file_path = os.path.join(model_folder_path, file_name)
@@ -50,36 +54,93 @@ class Linear_QNet(nn.Module):
             print(">>> Do not find old data. Create new one<<<")
             return False, 0, 0
 
+# --- TRAINER: one DQN update per train_step call ---
+# Optional frozen target network for the bootstrap targets:
+#   target_update=N  hard update, copy the online weights every N updates
+#   tau=t            soft (Polyak) update after every step: target += t * (online - target)
+# double_dqn: the online network picks the next action, the target network
+# scores it (with no target network both roles fall to the online one).
 class QTrainer:
-    def __init__(self, model, lr, gamma):
+    def __init__(self, model, lr, gamma, target_update=0, tau=0.0, double_dqn=False):
         self.lr = lr
         self.gamma = gamma
         self.model = model
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
         self.criterion = nn.MSELoss()
+        self.profiler = NULL_PROFILER
+        self.target_update = target_update
+        self.tau = tau
+        self.double_dqn = double_dqn
+        self.n_updates = 0
+        self.target_model = None
+        if target_update > 0 or tau > 0:
+            self.target_model = copy.deepcopy(model)
+            self.target_model.requires_grad_(False)
+            self.target_model.eval()
 
-    def train_step(self, state, action, reward, next_state, done):
-        state = torch.tensor(state, dtype=torch.float)
-        next_state = torch.tensor(next_state, dtype=torch.float)
-        action = torch.tensor(action, dtype=torch.long)
-        reward = torch.tensor(reward, dtype=torch.float)
+    def sync_target(self):
+        if self.target_model is not None:
+            self.target_model.load_state_dict(self.model.state_dict())
+
+    def _update_target(self):
+        self.n_updates += 1
+        if self.target_model is None:
+            return
+        if self.tau > 0:
+            with torch.no_grad():
+                for target, online in zip(self.target_model.parameters(), self.model.parameters()):
+                    target.lerp_(online, self.tau)
+        elif self.n_updates % self.target_update == 0:
+            self.sync_target()
+
+    def train_step(self, state, action, reward, next_state, done, weights=None):
+        # Tensors from ReplayBuffer are used as they are, Python/NumPy data is wrapped
+        state = torch.as_tensor(np.asarray(state), dtype=torch.float)
+        next_state = torch.as_tensor(np.asarray(next_state), dtype=torch.float)
+        if not isinstance(action, torch.Tensor):
+            action = np.array(action) # copy: MOVES rows are read-only
+        action = torch.as_tensor(action, dtype=torch.long)
+        reward = torch.as_tensor(np.asarray(reward), dtype=torch.float)
+        done = torch.as_tensor(np.asarray(done), dtype=torch.bool)
 
         if len(state.shape) == 1:
             state = torch.unsqueeze(state, 0)
             next_state = torch.unsqueeze(next_state, 0)
             action = torch.unsqueeze(action, 0)
             reward = torch.unsqueeze(reward, 0)
-            done = (done, )
+            done = torch.unsqueeze(done, 0)
+
+        with self.profiler.phase('train_step.forward'):
+            pred = self.model(state)
 
-        pred = self.model(state)
-        target = pred.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(self.model(next_state[idx]))
-            target[idx][torch.argmax(action[idx]).item()] = Q_new
+            # Bellman targets for the whole batch: one forward pass over the next
+            # states, terminal transitions keep only the reward
+            with torch.no_grad():
+                evaluator = self.target_model if self.target_model is not None else self.model
+                Q_eval = evaluator(next_state)
+                if self.double_dqn and evaluator is not self.model:
+                    next_action = torch.argmax(self.model(next_state), dim=1, keepdim=True)
+                    Q_next = Q_eval.gather(1, next_action).squeeze(1)
+                else:
+                    Q_next = torch.max(Q_eval, dim=1).values
+            Q_new = torch.where(done, reward, reward + self.gamma * Q_next)
+            target = pred.detach().clone()
+            rows = torch.arange(len(done))
+            action_idx = torch.argmax(action, dim=1)
+            target[rows, action_idx] = Q_new
     
-        self.optimizer.zero_grad()
-        loss = self.criterion(target, pred)
-        loss.backward()
-        self.optimizer.step()
\ No newline at end of file
+        with self.profiler.phase('train_step.backward'):
+            self.optimizer.zero_grad()
+            if weights is None:
+                loss = self.criterion(target, pred)
+            else:
+                # Importance-sampling weights from prioritized replay, one per sample
+                loss = (weights.unsqueeze(1) * (target - pred) ** 2).mean()
+            loss.backward()
+        with self.profiler.phase('train_step.optimizer'):
+            self.optimizer.step()
+            self._update_target()
+        self.profiler.count('train_step.samples', len(done))
+
+        # TD errors, used to refresh replay priorities
+        return (Q_new - pred[rows, action_idx]).detach().numpy()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import sys
+import numpy as np
+
+from base_agent import BaseAgent
+from config import RunConfig
+from state_encoder import STATES, state_codes
+
+# --- NUMPY Q-NETWORK: Linear_QNet inference without torch ---
+# The exported .npz holds the two layers' weights plus `policy`, the greedy
+# move for each of the 2048 possible states, worked out by torch itself at
+# export time. Playing is then a table lookup that picks exactly the moves
+# the torch model would; forward() gives the Q-values when they are needed.
+class NumpyQNet:
+    def __init__(self, w1, b1, w2, b2, policy=None):
+        self.w1 = w1
+        self.b1 = b1
+        self.w2 = w2
+        self.b2 = b2
+        self.policy = policy
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            policy = data['policy'] if 'policy' in data else None
+            return cls(data['linear1.weight'], data['linear1.bias'],
+                       data['linear2.weight'], data['linear2.bias'], policy)
+
+    @classmethod
+    def from_state_dict(cls, state_dict):
+        # Linear_QNet state_dict (torch tensors) -> NumpyQNet with its policy table; needs torch
+        arrays = {name: value.detach().cpu().numpy() for name, value in state_dict.items()}
+        return cls(arrays['linear1.weight'], arrays['linear1.bias'],
+                   arrays['linear2.weight'], arrays['linear2.bias'], torch_policy(state_dict))
+
+    @classmethod
+    def random(cls, input_size=11, hidden_size=256, output_size=3, seed=None):
+        # Same init ranges as nn.Linear: U(-1/sqrt(fan_in), 1/sqrt(fan_in))
+        rng = np.random.default_rng(seed)
+        def uniform(fan_in, shape):
+            bound = 1 / np.sqrt(fan_in)
+            return rng.uniform(-bound, bound, shape).astype(np.float32)
+        return cls(uniform(input_size, (hidden_size, input_size)), uniform(input_size, hidden_size),
+                   uniform(hidden_size, (output_size, hidden_size)), uniform(hidden_size, output_size))
+
+    def forward(self, x):
+        hidden = np.maximum(np.asarray(x, dtype=np.float32) @ self.w1.T + self.b1, 0)
+        return hidden @ self.w2.T + self.b2
+
+    def predict(self, states):
+        # Greedy move index for each state
+        if self.policy is not None:
+            return self.policy[state_codes(states)]
+        return self.forward(states).argmax(axis=1)
+
+class NumpyAgent(BaseAgent):
+    # Play-only agent (watch and versus modes): no torch, no training
+    def __init__(self, net, seed=None):
+        self.net = net
+        self.seed_rng(seed)
+
+    def _predict(self, states):
+        return self.net.predict(states)
+
+def torch_policy(state_dict):
+    # Greedy move of the torch model for each of the 2048 states
+    import torch
+    import torch.nn.functional as F
+    w1, b1 = state_dict['linear1.weight'], state_dict['linear1.bias']
+    w2, b2 = state_dict['linear2.weight'], state_dict['linear2.bias']
+    states = torch.from_numpy(STATES.astype(np.float32))
+    with torch.inference_mode():
+        # One state per forward pass, as Agent._predict runs in play: a
+        # different batch size could round differently and flip a near-tie
+        return np.array([torch.argmax(F.linear(F.relu(F.linear(states[i:i + 1], w1, b1)), w2, b2)).item()
+                         for i in range(len(states))], dtype=np.uint8)
+
+def export_state_dict(state_dict, path):
+    # Linear_QNet state_dict (torch tensors) -> .npz; needs torch
+    arrays = {name: value.detach().cpu().numpy() for name, value in state_dict.items()}
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, policy=torch_policy(state_dict), **arrays)
+    os.replace(tmp_path, path)
+
+def load_model_state(checkpoint_path):
+    # A checkpoint from Linear_QNet.save / Checkpointer, or a bare state_dict
+    import torch
+    checkpoint = torch.load(checkpoint_path)
+    if isinstance(checkpoint, dict) and 'model_state' in checkpoint:
+        checkpoint = checkpoint['model_state']
+    return checkpoint
+
+def load_run_config(checkpoint_path):
+    # The RunConfig a checkpoint was trained with; None for .npz exports and older checkpoints
+    if checkpoint_path.endswith('.npz'):
+        return None
+    import torch
+    checkpoint = torch.load(checkpoint_path)
+    if isinstance(checkpoint, dict) and 'config' in checkpoint:
+        return RunConfig(**checkpoint['config'])
+    return None
+
+def export_checkpoint(checkpoint_path, path):
+    export_state_dict(load_model_state(checkpoint_path), path)
+
+def load_play_agent(folder='./model', seed=None, hidden_size=256):
+    # Re-export when model.pth is newer than model.npz and torch is around;
+    # a build without torch plays whatever model.npz it ships with
+    checkpoint_path = os.path.join(folder, 'model.pth')
+    path = os.path.join(folder, 'model.npz')
+    if os.path.exists(checkpoint_path) and (not os.path.exists(path)
+                                            or os.path.getmtime(checkpoint_path) > os.path.getmtime(path)):
+        try:
+            export_checkpoint(checkpoint_path, path)
+        except ImportError:
+            pass
+
+    if os.path.exists(path):
+        print(f">>> Model loaded for play: {path} <<<")
+        return NumpyAgent(NumpyQNet.load(path), seed)
+    print(">>> Do not find old data. Create new one<<<")
+    # The fresh weights come from the agent's seed too, so --seed repeats them
+    agent = NumpyAgent(None, seed)
+    agent.net = NumpyQNet.random(hidden_size=hidden_size, seed=agent.seed_sequence.spawn(1)[0])
+    return agent
+
+if __name__ == '__main__':
+    # python numpy_qnet.py [model.pth] [model.npz]
+    checkpoint_path = sys.argv[1] if len(sys.argv) > 1 else './model/model.pth'
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(checkpoint_path)[0] + '.npz'
+    export_checkpoint(checkpoint_path, path)
+    print(f">>> Exported {checkpoint_path} -> {path} ({os.path.getsize(path)} bytes) <<<")
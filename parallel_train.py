@@ -0,0 +1,131 @@
+import queue
+import signal
+import sys
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from agent import make_plotter
+from dqn_agent import Agent
+from model import Linear_QNet
+from snake_game_env import SnakeGameAI
+
+CHUNK_SIZE = 256 # transitions per message sent to the learner
+
+# --- WORKER: plays headless games with a periodically synced model copy ---
+def _worker(shared_model, lock, version, n_games, transitions, stop, seeds, config):
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # the learner handles Ctrl+C
+    signal.signal(signal.SIGTERM, signal.SIG_DFL) # undo SDL's handler: terminate() must stop a worker
+    torch.set_num_threads(1)
+    agent_seed, game_seed = seeds
+    agent = Agent(training_mode=True, load_model=False, seed=agent_seed, config=config)
+    game = SnakeGameAI(config.cols, config.rows, headless=True, seed=game_seed)
+    local_version = -1
+    chunk = []
+    scores = []
+
+    while not stop.is_set():
+        if version.value != local_version:
+            with lock:
+                agent.model.load_state_dict(shared_model.state_dict())
+                local_version = version.value
+
+        state_old = agent.get_state(game)
+        final_move = agent.get_action(state_old)
+        reward, done, score = game.play_step(final_move)
+        state_new = agent.get_state(game)
+        chunk.append((state_old, final_move, reward, state_new, done))
+
+        if done:
+            game.reset()
+            scores.append(score)
+            agent.n_games = n_games.value
+
+        if done or len(chunk) >= CHUNK_SIZE:
+            states, actions, rewards, next_states, dones = zip(*chunk)
+            message = (np.array(states, dtype=np.uint8), np.array(actions, dtype=np.uint8),
+                       np.array(rewards, dtype=np.float32), np.array(next_states, dtype=np.uint8),
+                       np.array(dones, dtype=bool), scores)
+            # Bounded queue: block while the learner is behind, but notice stop
+            while not stop.is_set():
+                try:
+                    transitions.put(message, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+            chunk = []
+            scores = []
+
+# --- LEARNER: owns the replay memory and the trainer ---
+def train_ai_parallel(n_workers=4, sync_every=10, queue_size=64, prioritized_replay=False,
+                      metrics_file=None, keep_checkpoints=3, save_memory=False, replay_file=None,
+                      target_update=0, tau=0.0, double_dqn=False, seed=None, config=None):
+    ctx = mp.get_context('spawn')
+    # pygame's SDL swallows SIGTERM; exit through the finally below so the workers stop too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+    agent = Agent(training_mode=True, prioritized_replay=prioritized_replay,
+                  keep_checkpoints=keep_checkpoints, save_memory=save_memory, replay_file=replay_file,
+                  target_update=target_update, tau=tau, double_dqn=double_dqn, seed=seed,
+                  config=config)
+    config = agent.config
+    record = agent.loaded_record
+    plotter = make_plotter(True, metrics_file)
+
+    # Weights are broadcast through one model in shared memory
+    shared_model = Linear_QNet(11, config.hidden_size, 3)
+    shared_model.load_state_dict(agent.model.state_dict())
+    shared_model.share_memory()
+    lock = ctx.Lock()
+    version = ctx.Value('i', 0)
+    n_games = ctx.Value('i', agent.n_games)
+    stop = ctx.Event()
+    transitions = ctx.Queue(maxsize=queue_size)
+
+    # Every worker explores and places food with its own streams, derived from the learner's seed
+    worker_seeds = [tuple(int(s) for s in child.generate_state(2)) for child in agent.seed_sequence.spawn(n_workers)]
+    workers = [ctx.Process(target=_worker, daemon=True,
+                           args=(shared_model, lock, version, n_games, transitions, stop, seeds, config))
+               for seeds in worker_seeds]
+    for w in workers:
+        w.start()
+    print(f">>> Parallel training: {n_workers} workers, weights synced every {sync_every} updates, "
+          f"seed {agent.seed} <<<")
+
+    updates = 0
+    try:
+        while True:
+            states, actions, rewards, next_states, dones, scores = transitions.get()
+            agent.memory.extend(states, actions, rewards, next_states, dones)
+            agent.train_short_memory(states, actions, rewards, next_states, dones)
+            updates += 1
+
+            for score in scores:
+                agent.n_games += 1
+                agent.train_long_memory()
+                updates += 1
+
+                if score > record:
+                    record = score
+                    agent.save(record)
+                    print(f">>> New record: {record} (Saved) <<<")
+                elif agent.n_games % 10 == 0:
+                    agent.save(record)
+                    print(">>> Auto Save <<<")
+
+                print(f'Game {agent.n_games} Score {score} Record {record}')
+                if plotter:
+                    plotter.push(score)
+            n_games.value = agent.n_games
+
+            if updates >= sync_every:
+                with lock:
+                    shared_model.load_state_dict(agent.model.state_dict())
+                    version.value += 1
+                updates = 0
+    finally:
+        stop.set()
+        for w in workers:
+            w.join(timeout=2)
+            if w.is_alive():
+                w.terminate()
@@ -0,0 +1,153 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from config import RunConfig
+from numpy_qnet import NumpyQNet, NumpyAgent, export_state_dict, load_model_state
+from snake_game_env import SnakeGameAI, Point, Direction
+from snake_vec_env import SnakeGameVec
+from state_encoder import PAD, STATES
+
+BOARDS = ((10, 8), (32, 24)) # cells
+MOVES = np.eye(3, dtype=int) # straight, right, left
+
+# --- PARITY CHECKS: the fast paths must match what old checkpoints were trained on ---
+# A model.pth only keeps playing the same game if the 11 features, the rules
+# and the greedy moves stay exactly as they were:
+#   encoder  Agent.get_state (grid + lookup table) vs the original is_collision code
+#   vec      SnakeGameVec vs SnakeGameAI, step by step, with the food positions synced
+#   policy   the NumPy engine's table vs the torch model, on all 2048 states
+# Every check counts mismatches; any mismatch fails the run.
+def reference_state(game):
+    # Agent._calculate_state as first written: is_collision on the four
+    # neighbours against the body list, no grid, no table
+    head = game.head
+    body = list(game.snake)[1:]
+
+    def collision(pt):
+        return pt.x >= game.cols or pt.x < 0 or pt.y >= game.rows or pt.y < 0 or pt in body
+
+    point_l = Point(head.x - 1, head.y)
+    point_r = Point(head.x + 1, head.y)
+    point_u = Point(head.x, head.y - 1)
+    point_d = Point(head.x, head.y + 1)
+    dir_l = game.direction == Direction.LEFT
+    dir_r = game.direction == Direction.RIGHT
+    dir_u = game.direction == Direction.UP
+    dir_d = game.direction == Direction.DOWN
+    food = game.food
+    return np.array([
+        (dir_r and collision(point_r)) or (dir_l and collision(point_l)) or
+        (dir_u and collision(point_u)) or (dir_d and collision(point_d)),
+        (dir_u and collision(point_r)) or (dir_d and collision(point_l)) or
+        (dir_l and collision(point_u)) or (dir_r and collision(point_d)),
+        (dir_d and collision(point_r)) or (dir_u and collision(point_l)) or
+        (dir_r and collision(point_u)) or (dir_l and collision(point_d)),
+        dir_l, dir_r, dir_u, dir_d,
+        food.x < head.x, food.x > head.x, food.y < head.y, food.y > head.y,
+    ], dtype=int)
+
+def pick_moves(states, rng):
+    # Mostly a random safe move, so snakes grow long; now and then any move
+    moves = rng.integers(0, 3, len(states))
+    for i, state in enumerate(states):
+        safe = np.flatnonzero(state[:3] == 0)
+        if len(safe) and rng.random() < 0.95:
+            moves[i] = rng.choice(safe)
+    return moves
+
+def check_encoder(cols, rows, n_games, seed):
+    agent = NumpyAgent(NumpyQNet.random(seed=seed), seed)
+    game = SnakeGameAI(cols, rows, headless=True, seed=seed)
+    rng = np.random.default_rng(seed)
+    n_states = n_diff = 0
+    for _ in range(n_games):
+        done = False
+        while not done:
+            state = agent.get_state(game)
+            n_states += 1
+            n_diff += not np.array_equal(state, reference_state(game))
+            _, done, _ = game.play_step(MOVES[pick_moves([state], rng)[0]])
+        game.reset()
+    return n_states, n_diff
+
+def _food_point(vec, cell):
+    return Point(int(cell % vec.stride) - PAD, int(cell // vec.stride) - PAD)
+
+def check_vec(cols, rows, n_envs, n_steps, seed):
+    vec = SnakeGameVec(n_envs, cols, rows, seed=seed)
+    games = [SnakeGameAI(cols, rows, headless=True, seed=seed + i) for i in range(n_envs)]
+    for i, game in enumerate(games):
+        game.food = _food_point(vec, vec.food[i])
+    rng = np.random.default_rng(seed)
+    states = vec.get_states()
+    n_diff = 0
+    for _ in range(n_steps):
+        actions = MOVES[pick_moves(states, rng)]
+        rewards, dones, scores, states = vec.step(actions)
+        for i, game in enumerate(games):
+            reward, done, score = game.play_step(actions[i])
+            if done:
+                game.reset()
+            # Food is drawn by the vec env's generator; the board game follows it
+            game.food = _food_point(vec, vec.food[i])
+            n_diff += (reward != rewards[i] or done != dones[i] or score != scores[i]
+                       or game.cell(game.head) != vec.head[i]
+                       or not np.array_equal(reference_state(game), states[i]))
+    return n_envs * n_steps, int(n_diff)
+
+def check_policy(state_dict):
+    # The torch moves come from Agent._predict, one state per call as in play
+    from dqn_agent import Agent
+    hidden_size = state_dict['linear1.weight'].shape[0]
+    agent = Agent(training_mode=False, load_model=False, config=RunConfig(hidden_size=hidden_size))
+    agent.model.load_state_dict(state_dict)
+    torch_moves = np.array([agent._predict(STATES[i:i + 1])[0] for i in range(len(STATES))])
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'model.npz')
+        export_state_dict(state_dict, path)
+        net = NumpyQNet.load(path)
+    return len(STATES), int((net.predict(STATES) != torch_moves).sum())
+
+def run_checks(checkpoints, seed=0, n_games=200, n_envs=64, n_steps=1000):
+    from model import Linear_QNet
+    import torch
+    results = []
+
+    def record(name, checked, differed):
+        results.append((name, checked, differed))
+        flag = '' if differed == 0 else '  <-- MISMATCH'
+        print(f'{name:<40} {checked:>10,} checked {differed:>8,} differ{flag}')
+
+    for cols, rows in BOARDS:
+        record(f'encoder/{cols}x{rows}', *check_encoder(cols, rows, n_games, seed))
+    for cols, rows in BOARDS:
+        record(f'vec/{cols}x{rows}', *check_vec(cols, rows, n_envs, n_steps, seed))
+    torch.manual_seed(seed)
+    record('policy/fresh', *check_policy(Linear_QNet(11, RunConfig().hidden_size, 3).state_dict()))
+    for path in checkpoints:
+        record(f'policy/{path}', *check_policy(load_model_state(path)))
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Check the fast paths against the original code')
+    parser.add_argument('checkpoints', nargs='*', default=None,
+                        help='model.pth files for the policy check (default: ./model/model.pth if present)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--games', type=int, default=200, help='encoder games per board')
+    parser.add_argument('--envs', type=int, default=64, help='boards per vec check')
+    parser.add_argument('--steps', type=int, default=1000, help='vec steps per board')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    checkpoints = args.checkpoints or [p for p in ['./model/model.pth'] if os.path.exists(p)]
+    results = run_checks(checkpoints, args.seed, args.games, args.envs, args.steps)
+    failed = [name for name, _, differed in results if differed]
+    if failed:
+        print(f">>> {len(failed)} parity check(s) failed: {', '.join(failed)} <<<")
+        sys.exit(1)
+    print(">>> All parity checks passed <<<")
@@ -0,0 +1,276 @@
+import argparse
+import os
+import struct
+from collections import deque
+
+import numpy as np
+
+from snake_game_env import SnakeGameAI, Point, Direction, DIRECTION_INDEX, SPEED
+
+MAGIC = b'SNAKEEP2'
+DIRECTIONS = (Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP) # clockwise
+MOVES = {0: [1, 0, 0], 1: [0, 1, 0], 3: [0, 0, 1]} # turn (clockwise quarters) -> action
+REASONS = (None, 'wall', 'body', 'timeout', 'win')
+NO_FOOD = 0xFFFF
+
+# Episode: seed, board cols/rows, steps, score, reason, start direction, start length
+EPISODE = struct.Struct('<QHHIIBBH')
+# Index entry: offset and length of the episode in the data file, game number, steps, score
+INDEX = struct.Struct('<QIQII')
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u4'), ('game', '<u8'),
+                        ('steps', '<u4'), ('score', '<u4')])
+
+# --- EPISODE LOG: seed + start position + 2 bits per move, append-only ---
+#   episodes.bin      MAGIC, then one record per finished game:
+#                     EPISODE header, start body and food as (x, y) cells
+#                     (uint16), then the directions taken, 4 per byte
+#   episodes.bin.idx  one INDEX entry per record, written after the record
+# Food positions are not stored: the game draws them from its own RNG,
+# seeded per game, so the seed and the moves rebuild every frame. Moves are
+# absolute directions (2 bits), turned back into actions on replay. A crash
+# can leave a record without its index entry, or an entry whose record never
+# reached the disk; both are cut off on the next open. A lost index is
+# rebuilt from the data file.
+def _pack(codes):
+    codes = np.concatenate([codes, np.zeros(-len(codes) % 4, dtype=np.uint8)]).reshape(-1, 4)
+    return (codes[:, 0] | codes[:, 1] << 2 | codes[:, 2] << 4 | codes[:, 3] << 6).astype(np.uint8)
+
+def _unpack(packed, n):
+    return ((packed[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).ravel()[:n]
+
+def _cell(pt):
+    return pt.x, pt.y
+
+def _check_magic(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an episode log (or one from an older version)")
+
+def read_index(path):
+    size = os.path.getsize(path + '.idx') if os.path.exists(path + '.idx') else 0
+    n = size // INDEX.size
+    if n == 0:
+        return np.zeros(0, dtype=INDEX_DTYPE)
+    return np.fromfile(path + '.idx', dtype=INDEX_DTYPE, count=n)
+
+def _rebuild_index(path):
+    # Entries for every whole record in the data file, games numbered from 1
+    with open(path, 'rb') as f:
+        data = f.read()
+    entries = []
+    offset = len(MAGIC)
+    while offset + EPISODE.size <= len(data):
+        _, _, _, steps, score, _, _, length = EPISODE.unpack_from(data, offset)
+        n = EPISODE.size + 4 * (length + 1) + (steps + 3) // 4
+        if offset + n > len(data):
+            break
+        entries.append((offset, n, len(entries) + 1, steps, score))
+        offset += n
+    return np.array(entries, dtype=INDEX_DTYPE)
+
+class EpisodeRecorder:
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            _check_magic(path)
+            if not os.path.exists(path + '.idx'):
+                _rebuild_index(path).tofile(path + '.idx')
+            # Keep the entries whose record is whole in the data file, then drop
+            # whatever a crash left behind the last of them
+            index = read_index(path)
+            index = index[:np.searchsorted(index['offset'] + index['length'], os.path.getsize(path), side='right')]
+            end = int(index['offset'][-1] + index['length'][-1]) if len(index) else len(MAGIC)
+            os.truncate(path, end)
+            os.truncate(path + '.idx', len(index) * INDEX.size)
+        else:
+            with open(path, 'wb') as f:
+                f.write(MAGIC)
+            index = np.zeros(0, dtype=INDEX_DTYPE)
+            end = len(MAGIC)
+            open(path + '.idx', 'wb').close()
+        self.data = open(path, 'ab')
+        self.index = open(path + '.idx', 'ab')
+        self.offset = end
+        self.game = int(index['game'][-1]) + 1 if len(index) else 1 # numbers are never reused
+        self.moves = bytearray()
+        self.start = None
+
+    def attach(self, game):
+        # Record from the game's current (freshly reset) position on
+        game.recorder = self
+        self.begin(game)
+
+    def begin(self, game):
+        self.moves = bytearray()
+        self.start = (game.seed, game.cols, game.rows, DIRECTION_INDEX[game.direction],
+                      [_cell(pt) for pt in game.snake],
+                      _cell(game.food) if game.food is not None else (NO_FOOD, NO_FOOD))
+
+    def step(self, direction):
+        self.moves.append(DIRECTION_INDEX[direction])
+
+    def end(self, game):
+        if self.start is None:
+            return
+        seed, cols, rows, direction, body, food = self.start
+        n = len(self.moves)
+        record = (EPISODE.pack(seed, cols, rows, n, game.score, REASONS.index(game.game_over_reason),
+                               direction, len(body))
+                  + np.array(body + [food], dtype='<u2').tobytes()
+                  + _pack(np.frombuffer(self.moves, dtype=np.uint8)).tobytes())
+        self.data.write(record)
+        self.data.flush()
+        self.index.write(INDEX.pack(self.offset, len(record), self.game, n, game.score))
+        self.index.flush()
+        self.offset += len(record)
+        self.game += 1
+        self.start = None
+
+    def close(self):
+        # An unfinished game is not written
+        self.data.close()
+        self.index.close()
+
+class Episode:
+    def __init__(self, game, buf):
+        self.game = game
+        (self.seed, self.cols, self.rows, self.steps, self.score, reason,
+         direction, length) = EPISODE.unpack_from(buf)
+        self.reason = REASONS[reason]
+        self.direction = DIRECTIONS[direction]
+        cells = np.frombuffer(buf, dtype='<u2', count=2 * (length + 1), offset=EPISODE.size).reshape(-1, 2)
+        self.snake = [Point(int(x), int(y)) for x, y in cells[:-1]]
+        fx, fy = cells[-1]
+        self.food = None if fx == NO_FOOD else Point(int(fx), int(fy))
+        packed = np.frombuffer(buf, dtype=np.uint8, offset=EPISODE.size + 4 * (length + 1))
+        self.directions = _unpack(packed, self.steps)
+        # Clockwise quarter turns between consecutive directions: 0, 1 (right) or 3 (left)
+        previous = np.concatenate([[direction], self.directions[:-1]]).astype(np.int8)
+        self.turns = (self.directions.astype(np.int8) - previous) % 4
+
+    def actions(self):
+        return [MOVES[int(turn)] for turn in self.turns]
+
+class EpisodeReader:
+    def __init__(self, path):
+        self.path = path
+        _check_magic(path)
+        self.index = read_index(path)
+        self.games = {int(game): i for i, game in enumerate(self.index['game'])}
+
+    def __len__(self):
+        return len(self.index)
+
+    def episode(self, game):
+        entry = self.index[self.games[game]]
+        with open(self.path, 'rb') as f:
+            f.seek(int(entry['offset']))
+            return Episode(game, f.read(int(entry['length'])))
+
+# --- REPLAY: deterministic re-simulation with a keyframe every K steps ---
+# The first pass plays the whole episode once and keeps a snapshot of the
+# game every `keyframe_every` steps; seek(t) restores the nearest snapshot
+# at or before t and plays at most K-1 moves from there.
+class Replay:
+    def __init__(self, episode, keyframe_every=200, game=None):
+        self.episode = episode
+        self.keyframe_every = keyframe_every
+        self.actions = episode.actions()
+        self.game = game or SnakeGameAI(episode.cols, episode.rows, headless=True)
+        self.keyframes = []
+        self._start()
+        for t in range(episode.steps):
+            if t % keyframe_every == 0:
+                self.keyframes.append(self._snapshot())
+            self._play(t)
+        if self.game.score != episode.score or self.game.game_over_reason != episode.reason:
+            raise ValueError(f"replay of game {episode.game} diverged: score {self.game.score} "
+                             f"({self.game.game_over_reason}), recorded {episode.score} ({episode.reason})")
+        self.t = episode.steps
+
+    def _start(self):
+        game = self.game
+        recorder, game.recorder = game.recorder, None
+        game.reset(self.episode.seed)
+        game.recorder = recorder
+        # Start position as recorded (the standard one, unless the game was set up by hand)
+        game.direction = self.episode.direction
+        game.snake = deque(self.episode.snake)
+        game.head = game.snake[0]
+        game.grid = bytearray(game.empty_grid)
+        game.free = game.empty_board.copy()
+        for pt in game.snake:
+            game.grid[game.cell(pt)] = 1
+            game.free.remove(pt)
+        game.food = self.episode.food
+        self.t = 0
+
+    def _play(self, t):
+        render, self.game.render = self.game.render, False
+        self.game.play_step(self.actions[t])
+        self.game.render = render
+
+    def _snapshot(self):
+        game = self.game
+        return (game.snake.copy(), game.head, game.direction, bytearray(game.grid), game.free.copy(),
+                game.food, game.score, game.frame_iteration, game.game_over_reason, game.won,
+                game.rng.getstate())
+
+    def _restore(self, snapshot):
+        game = self.game
+        (snake, game.head, game.direction, grid, free, game.food, game.score, game.frame_iteration,
+         game.game_over_reason, game.won, rng_state) = snapshot
+        game.snake = snake.copy()
+        game.grid = bytearray(grid)
+        game.free = free.copy()
+        game.rng.setstate(rng_state)
+
+    def seek(self, t):
+        # The game as it was after t moves (0: the start position)
+        t = max(0, min(t, self.episode.steps))
+        k = min(t // self.keyframe_every, len(self.keyframes) - 1) if self.keyframes else -1
+        if k < 0:
+            self._start()
+        elif not (k * self.keyframe_every <= self.t <= t):
+            self._restore(self.keyframes[k])
+            self.t = k * self.keyframe_every
+        while self.t < t:
+            self._play(self.t)
+            self.t += 1
+        return self.game
+
+def watch(episode, start=0, speed=SPEED):
+    # Replay on screen from move `start` to the end
+    game = SnakeGameAI(episode.cols, episode.rows, speed=speed) # play_step keeps the pace
+    replay = Replay(episode, game=game)
+    replay.seek(start)
+    if game.renderer:
+        game.renderer.invalidate()
+        game._update_ui()
+    for t in range(replay.t, episode.steps):
+        game.play_step(replay.actions[t])
+        replay.t += 1
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List, check or watch recorded games')
+    parser.add_argument('file', help='episode log written with --record')
+    parser.add_argument('--game', type=int, default=None, help='game number to show (default: list all)')
+    parser.add_argument('--step', type=int, default=0, help='with --game: board after this many moves')
+    parser.add_argument('--watch', action='store_true', help='with --game: replay on screen from --step')
+    args = parser.parse_args()
+    reader = EpisodeReader(args.file)
+
+    if args.game is None:
+        print(f">>> {args.file}: {len(reader)} games, {os.path.getsize(args.file):,} bytes <<<")
+        for entry in reader.index:
+            print(f"Game {entry['game']} Score {entry['score']} Steps {entry['steps']}")
+    elif args.watch:
+        watch(reader.episode(args.game), args.step)
+    else:
+        episode = reader.episode(args.game)
+        game = Replay(episode).seek(args.step)
+        print(f">>> Game {episode.game}: seed {episode.seed}, score {episode.score}, "
+              f"{episode.steps} steps, ended by {episode.reason} <<<")
+        print(f"Step {min(args.step, episode.steps)}: head {_cell(game.head)}, "
+              f"direction {game.direction.name}, length {len(game.snake)}, score {game.score}, "
+              f"food {_cell(game.food) if game.food else None}")
@@ -0,0 +1,248 @@
+import atexit
+import os
+
+import numpy as np
+import torch
+
+# --- REPLAY MEMORY: preallocated ring buffer of transitions ---
+# States are the 11 binary features, so they fit in uint8; actions are the
+# one-hot [straight, right, left] moves. About 30 bytes per transition.
+class ReplayBuffer:
+    FIELDS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+    def __init__(self, capacity, state_size=11, action_size=3, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=np.uint8)
+        self.actions = np.zeros((capacity, action_size), dtype=np.uint8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.uint8)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.pos = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def append(self, state, action, reward, next_state, done):
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        n = len(rewards)
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size):
+        # Without replacement, like random.sample; everything if there is too little
+        if self.size > batch_size:
+            idx = self.rng.choice(self.size, batch_size, replace=False)
+        else:
+            idx = np.arange(self.size)
+        return self.batch(idx)
+
+    def recent(self, k):
+        # The last k transitions, oldest first
+        k = min(k, self.size)
+        return self.batch((self.pos - k + np.arange(k)) % self.capacity)
+
+    def state_dict(self):
+        # Oldest transition first; the gathered copies no longer share memory with the buffer
+        idx = (self.pos - self.size + np.arange(self.size)) % self.capacity
+        return {name: torch.from_numpy(getattr(self, name)[idx]) for name in self.FIELDS}
+
+    def load_state_dict(self, state):
+        self.pos = 0
+        self.size = 0
+        n = min(len(state['rewards']), self.capacity)
+        self.extend(*(state[name][-n:].numpy() for name in self.FIELDS))
+
+    def batch(self, idx):
+        # Gathered arrays are wrapped, not copied, by torch.from_numpy
+        return (torch.from_numpy(self.states[idx]),
+                torch.from_numpy(self.actions[idx]),
+                torch.from_numpy(self.rewards[idx]),
+                torch.from_numpy(self.next_states[idx]),
+                torch.from_numpy(self.dones[idx]))
+
+# --- SUM TREE: priorities in a binary heap layout, tree[1] is the total ---
+# Leaves sit at [leaves, 2 * leaves); leaves is a power of two so every
+# leaf has the same depth and a whole batch can walk down level by level.
+class SumTree:
+    def __init__(self, capacity):
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def priority(self, idx):
+        return self.tree[idx + self.leaves]
+
+    def set(self, idx, priority):
+        # Single leaf: plain Python walk up, cheaper than NumPy for one index
+        node = idx + self.leaves
+        tree = self.tree
+        tree[node] = priority
+        node //= 2
+        while node >= 1:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+
+    def update(self, idx, priorities):
+        node = np.asarray(idx) + self.leaves
+        self.tree[node] = priorities
+        node = np.unique(node // 2)
+        while node[0] >= 1:
+            self.tree[node] = self.tree[2 * node] + self.tree[2 * node + 1]
+            if node[0] == 1:
+                break
+            node = np.unique(node // 2)
+
+    def find(self, values):
+        # Leaf whose cumulative priority range contains each value: O(log n)
+        node = np.ones(len(values), dtype=np.int64)
+        while node[0] < self.leaves:
+            left = 2 * node
+            left_sum = self.tree[left]
+            go_right = values >= left_sum
+            values = np.where(go_right, values - left_sum, values)
+            node = left + go_right
+        return node - self.leaves
+
+# --- PRIORITIZED REPLAY: sample by TD error, correct with IS weights ---
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, capacity, state_size=11, action_size=3,
+                 alpha=0.6, beta=0.4, beta_increment=0.001, eps=0.01, seed=None):
+        super().__init__(capacity, state_size, action_size, seed)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.eps = eps
+        self.max_priority = 1.0
+
+    def append(self, state, action, reward, next_state, done):
+        # New transitions get the highest priority so they are replayed at least once
+        self.tree.set(self.pos, self.max_priority)
+        super().append(state, action, reward, next_state, done)
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        idx = (self.pos + np.arange(len(rewards))) % self.capacity
+        self.tree.update(idx, self.max_priority)
+        super().extend(states, actions, rewards, next_states, dones)
+
+    def sample(self, batch_size):
+        # Stratified: one draw from each of n equal slices of the total priority
+        n = min(batch_size, self.size)
+        total = self.tree.total()
+        values = (np.arange(n) + self.rng.random(n)) * (total / n)
+        idx = np.minimum(self.tree.find(values), self.size - 1)
+
+        probs = self.tree.priority(idx) / total
+        weights = (self.size * probs) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self.batch(idx) + (torch.from_numpy(weights.astype(np.float32)), idx)
+
+    def update_priorities(self, idx, td_errors):
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        self.tree.update(idx, priorities)
+        self.max_priority = max(self.max_priority, priorities.max())
+
+
+# --- ON-DISK REPLAY: same ring buffer, stored in a memory-mapped file ---
+# File layout: a HEADER_SIZE-byte header, then `capacity` fixed-width records
+# (see record_dtype), 30 bytes each with the default sizes. pos and size live
+# in the header and are updated on every write, so readers opened with
+# readonly=True see new transitions as they land. The file persists across
+# sessions: opening an existing one resumes where it stopped.
+MAGIC = b'SNAKERB1'
+HEADER = np.dtype([('magic', 'S8'), ('capacity', '<i8'), ('pos', '<i8'), ('size', '<i8'),
+                   ('state_size', '<i4'), ('action_size', '<i4')])
+HEADER_SIZE = 64
+
+def record_dtype(state_size=11, action_size=3):
+    return np.dtype([('state', 'u1', (state_size,)), ('action', 'u1', (action_size,)),
+                     ('reward', '<f4'), ('next_state', 'u1', (state_size,)), ('done', 'u1')])
+
+class MmapReplayBuffer(ReplayBuffer):
+    def __init__(self, path, capacity=10_000_000, state_size=11, action_size=3, readonly=False, seed=None):
+        self.path = path
+        self.readonly = readonly
+        if not os.path.exists(path):
+            if readonly:
+                raise FileNotFoundError(path)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            header = np.zeros(1, dtype=HEADER)
+            header[0] = (MAGIC, capacity, 0, 0, state_size, action_size)
+            with open(path, 'wb') as f:
+                f.write(header.tobytes().ljust(HEADER_SIZE, b'\0'))
+                # Sparse file: disk space is only used as records are written
+                f.truncate(HEADER_SIZE + capacity * record_dtype(state_size, action_size).itemsize)
+
+        mode = 'r' if readonly else 'r+'
+        self._header_map = np.memmap(path, dtype=HEADER, mode=mode, shape=(1,))
+        header = self._header_map[0]
+        if header['magic'] != MAGIC:
+            raise ValueError(f'{path} is not a replay buffer file')
+        self.capacity = int(header['capacity'])
+        self._records_map = np.memmap(path, dtype=record_dtype(int(header['state_size']), int(header['action_size'])),
+                                      mode=mode, offset=HEADER_SIZE, shape=(self.capacity,))
+        # Plain ndarray views of the mapping: np.memmap adds overhead to every indexing op
+        self._counters = self._header_map.view(np.ndarray).view(np.int64)[2:4] # pos, size
+        self.records = self._records_map.view(np.ndarray)
+        # Field views, so the inherited append/extend write straight into the file
+        self.states = self.records['state']
+        self.actions = self.records['action']
+        self.rewards = self.records['reward']
+        self.next_states = self.records['next_state']
+        self.dones = self.records['done']
+        self.rng = np.random.default_rng(seed)
+        if not readonly:
+            atexit.register(self.flush)
+
+    @property
+    def pos(self):
+        return int(self._counters[0])
+
+    @pos.setter
+    def pos(self, value):
+        self._counters[0] = value
+
+    @property
+    def size(self):
+        return int(self._counters[1])
+
+    @size.setter
+    def size(self, value):
+        self._counters[1] = value
+
+    def flush(self):
+        # Push written pages to disk; other processes already see them through the page cache
+        self._records_map.flush()
+        self._header_map.flush()
+
+    def batch(self, idx):
+        # One read per record, in file order; the fields are copied out of the
+        # packed records since torch needs aligned, contiguous data
+        records = self.records[np.sort(idx)]
+        return (torch.from_numpy(np.ascontiguousarray(records['state'])),
+                torch.from_numpy(np.ascontiguousarray(records['action'])),
+                torch.from_numpy(np.ascontiguousarray(records['reward'])),
+                torch.from_numpy(np.ascontiguousarray(records['next_state'])),
+                torch.from_numpy(records['done'].astype(bool)))
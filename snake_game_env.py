@@ -3,7 +3,8 @@ import random
 import numpy as np
 
 from enum import Enum
-from collections import namedtuple
+from collections import namedtuple, deque
+from state_encoder import empty_grid, grid_stride, cell_index
 
 pygame.init()
 # Using SysFont to avoid file path errors
@@ -15,6 +16,9 @@ class Direction(Enum):
     UP = 3
     DOWN = 4
 
+# Position of each direction in clockwise order (RIGHT, DOWN, LEFT, UP)
+DIRECTION_INDEX = {Direction.RIGHT: 0, Direction.DOWN: 1, Direction.LEFT: 2, Direction.UP: 3}
+
 Point = namedtuple('Point', 'x, y')
 
 # Colors
@@ -26,85 +30,291 @@ BLACK = (0, 0, 0)
 GREEN1 = (0, 255, 0)
 GREEN2 = (0, 200, 0)
 
-BLOCK_SIZE = 20
+# Window defaults (see config.RunConfig): the game itself counts in cells
+BLOCK_SIZE = 20 # pixels per cell
 SPEED = 80 # Adjust speed here (20 is slow, 40 is standard, 100 is fast)
 
+# --- FREE CELLS: empty board cells with O(1) add / remove / random pick ---
+class FreeCells:
+    def __init__(self, cols, rows):
+        self.cells = [Point(x, y) for y in range(rows) for x in range(cols)]
+        self.index = {pt: i for i, pt in enumerate(self.cells)}
+
+    def copy(self):
+        other = FreeCells.__new__(FreeCells)
+        other.cells = self.cells.copy()
+        other.index = self.index.copy()
+        return other
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, pt):
+        if pt not in self.index:
+            self.index[pt] = len(self.cells)
+            self.cells.append(pt)
+
+    def remove(self, pt):
+        # Swap with the last cell so the list never has holes
+        idx = self.index.pop(pt, None)
+        if idx is None:
+            return
+        last = self.cells.pop()
+        if idx < len(self.cells):
+            self.cells[idx] = last
+            self.index[last] = idx
+
+    def sample(self, rng):
+        if not self.cells:
+            return None
+        return rng.choice(self.cells)
+
+# --- BOARD RENDERER: redraws only what changed since the last frame ---
+# Remembers the body cells, food and score it last drew; each frame it
+# repaints the cells that differ (set difference with the new body), re-blits
+# the cached score text when needed, and returns the dirty rects for
+# pygame.display.update. invalidate() forces a full redraw of the board.
+# Points are cells; block_size turns them into pixels.
+class BoardRenderer:
+    def __init__(self, display, cols, rows, label, font, colors=(BLUE1, BLUE2), offset=0, block_size=BLOCK_SIZE):
+        self.display = display
+        self.cols = cols
+        self.rows = rows
+        self.block_size = block_size
+        self.w = cols * block_size
+        self.h = rows * block_size
+        self.label = label
+        self.font = font
+        self.outer, self.inner = colors
+        self.offset = offset
+        self.invalidate()
+
+    def invalidate(self):
+        self.full = True
+        self.body = set()
+        self.food = None
+        self.score = None
+        self.text = None
+        self.text_rect = None
+
+    def _rect(self, pt):
+        size = self.block_size
+        return pygame.Rect(pt.x * size + self.offset, pt.y * size, size, size)
+
+    def _draw_cell(self, pt):
+        if pt.x < 0 or pt.x >= self.cols or pt.y < 0 or pt.y >= self.rows:
+            return None # a head that hit the wall, never drawn
+        rect = self._rect(pt)
+        if pt in self.body:
+            inset = self.block_size // 5
+            pygame.draw.rect(self.display, self.outer, rect)
+            pygame.draw.rect(self.display, self.inner, rect.inflate(-2 * inset, -2 * inset))
+        elif pt == self.food:
+            pygame.draw.rect(self.display, RED, rect)
+        else:
+            self.display.fill(BLACK, rect)
+        return rect
+
+    def _draw_area(self, area):
+        # Repaint every cell under `area`, e.g. where the score text was
+        size = self.block_size
+        x0 = max(0, (area.left - self.offset) // size)
+        x1 = min(self.w, area.right - self.offset) // size
+        y1 = min(self.h, area.bottom) // size
+        for y in range(max(0, area.top // size), y1 + 1):
+            for x in range(x0, x1 + 1):
+                self._draw_cell(Point(x, y))
+
+    def draw(self, snake, food, score):
+        body = set(snake)
+        if self.full:
+            self.display.fill(BLACK, pygame.Rect(self.offset, 0, self.w, self.h))
+            changed = set(body)
+        else:
+            changed = body ^ self.body
+        if food != self.food:
+            changed.add(self.food)
+            changed.add(food)
+        self.body = body
+        self.food = food
+
+        dirty = []
+        for pt in changed:
+            if pt is not None:
+                rect = self._draw_cell(pt)
+                if rect:
+                    dirty.append(rect)
+
+        # Score text: rendered once per score, re-blitted when a cell under it was repainted
+        if score != self.score or (self.text_rect and self.text_rect.collidelist(dirty) != -1):
+            area = self.text_rect
+            if score != self.score:
+                self.score = score
+                self.text = self.font.render(self.label + str(score), True, WHITE)
+                self.text_rect = self.text.get_rect(topleft=(self.offset, 0))
+                area = self.text_rect.union(area) if area else self.text_rect
+            self.display.fill(BLACK, area)
+            self._draw_area(area)
+            self.display.blit(self.text, self.text_rect)
+            dirty.append(area)
+
+        if self.full:
+            self.full = False
+            return [pygame.Rect(self.offset, 0, self.w, self.h)]
+        return dirty
+
 # --- CLASS 1: STANDARD AI ENVIRONMENT ---
 class SnakeGameAI:
 
-    def __init__(self, w=640, h=480):
-        self.w = w
-        self.h = h
-        self.display = pygame.display.set_mode((self.w, self.h))
+    def __init__(self, cols=32, rows=24, headless=False, render_every=0, seed=None,
+                 block_size=BLOCK_SIZE, speed=SPEED):
+        # Positions are integer (x, y) cells; block_size and speed only matter on screen
+        self.cols = cols
+        self.rows = rows
+        self.block_size = block_size
+        self.speed = speed
+        self.w = cols * block_size
+        self.h = rows * block_size
+        # Headless: no window, no event pump, no frame limiter.
+        # render_every=N still shows every N-th game for spot checks.
+        self.headless = headless
+        self.render_every = render_every
+        self.display = None
+        self.clock = None
+        self.renderer = None
+        self.n_resets = 0
+        # seeds: one seed per game; rng: food placement within a game
+        self.seeds = random.Random(seed)
+        self.rng = random.Random()
+        self.seed = None
+        self.recorder = None # recorder.EpisodeRecorder, see attach()
+        self.empty_board = FreeCells(cols, rows)
+        self.stride = grid_stride(cols)
+        self.empty_grid = empty_grid(cols, rows)
+        if not headless:
+            self._init_display()
+        self.reset()
+
+    def _init_display(self):
+        try:
+            self.display = pygame.display.set_mode((self.w, self.h))
+        except pygame.error as e:
+            print(f">>> No display available, rendering disabled ({e}) <<<")
+            self.render_every = 0
+            return False
         pygame.display.set_caption('Snake AI Training')
         self.clock = pygame.time.Clock()
-        self.reset()
+        self.renderer = BoardRenderer(self.display, self.cols, self.rows, "Score: ", font,
+                                      block_size=self.block_size)
+        return True
+
+    def reset(self, seed=None):
+        self.n_resets += 1
+        # Food comes from the game's own RNG: the seed and the moves replay a whole game
+        self.seed = self.seeds.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.seed)
+        self.render = not self.headless
+        if self.headless and self.render_every > 0 and self.n_resets % self.render_every == 0:
+            self.render = self.display is not None or self._init_display()
+        if self.render and self.renderer:
+            # The window may be stale after unrendered games: start from a clean frame
+            self.renderer.invalidate()
 
-    def reset(self):
         self.direction = Direction.RIGHT
-        self.head = Point(self.w / 2, self.h / 2)
-        self.snake = [self.head,
-                      Point(self.head.x - BLOCK_SIZE, self.head.y),
-                      Point(self.head.x - (2 * BLOCK_SIZE), self.head.y)]
+        self.head = Point(self.cols // 2, self.rows // 2)
+        self.snake = deque([self.head,
+                            Point(self.head.x - 1, self.head.y),
+                            Point(self.head.x - 2, self.head.y)])
+        # Occupancy grid of the body (walls included): O(1) collision checks
+        self.grid = bytearray(self.empty_grid)
+        self.free = self.empty_board.copy()
+        for pt in self.snake:
+            self.grid[self.cell(pt)] = 1
+            self.free.remove(pt)
         self.score = 0
+        self.won = False
+        # Why the last game ended: 'wall', 'body', 'timeout' or 'win'
+        self.game_over_reason = None
         self.food = None
         self._place_food()
         self.frame_iteration = 0
+        if self.recorder is not None:
+            self.recorder.begin(self)
 
     def _place_food(self):
-        x = random.randint(0, (self.w - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-        y = random.randint(0, (self.h - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-        self.food = Point(x, y)
-        if self.food in self.snake:
-            self._place_food()
+        # Returns False when the snake fills the whole board
+        self.food = self.free.sample(self.rng)
+        return self.food is not None
 
     def play_step(self, action):
         self.frame_iteration += 1
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
+        if self.render:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    quit()
         
         self._move(action)
-        self.snake.insert(0, self.head)
+        if self.recorder is not None:
+            self.recorder.step(self.direction)
+        # Checked before the head goes in: the whole old body (tail included) counts
+        collided = self.is_collision()
+        self.snake.appendleft(self.head)
+        self.grid[self.cell(self.head)] = 1
+        self.free.remove(self.head)
         
         reward = 0
         game_over = False
-        if self.is_collision() or self.frame_iteration > 100*len(self.snake):
+        if collided or self.frame_iteration > 100*len(self.snake):
             game_over = True
             reward = -10
+            if not collided:
+                self.game_over_reason = 'timeout'
+            else:
+                self.game_over_reason = 'wall' if self._out_of_bounds(self.head) else 'body'
+            if self.recorder is not None:
+                self.recorder.end(self)
             return reward, game_over, self.score
 
         if self.head == self.food:
             self.score += 1
             reward = 10
-            self._place_food()
+            if not self._place_food():
+                # Board full: nothing left to eat, the game is won
+                self.won = True
+                self.game_over_reason = 'win'
+                game_over = True
+                if self.recorder is not None:
+                    self.recorder.end(self)
+                return reward, game_over, self.score
         else:
-            self.snake.pop()
+            tail = self.snake.pop()
+            self.grid[self.cell(tail)] = 0
+            self.free.add(tail)
         
-        self._update_ui()
-        self.clock.tick(SPEED)
+        if self.render:
+            self._update_ui()
+            self.clock.tick(self.speed)
         return reward, game_over, self.score
 
+    def _out_of_bounds(self, pt):
+        return pt.x >= self.cols or pt.x < 0 or pt.y >= self.rows or pt.y < 0
+
     def is_collision(self, pt=None):
         if pt is None:
             pt = self.head
-        if pt.x > self.w - BLOCK_SIZE or pt.x < 0 or pt.y > self.h - BLOCK_SIZE or pt.y < 0:
+        if self._out_of_bounds(pt):
             return True
-        if pt in self.snake[1:]:
+        if self.grid[self.cell(pt)] and pt != self.snake[0]:
             return True
         return False
 
-    def _update_ui(self):
-        self.display.fill(BLACK)
-        for pt in self.snake:
-            pygame.draw.rect(self.display, BLUE1, pygame.Rect(pt.x, pt.y, BLOCK_SIZE, BLOCK_SIZE))
-            pygame.draw.rect(self.display, BLUE2, pygame.Rect(pt.x+4, pt.y+4, 12, 12))
+    def cell(self, pt):
+        # Index of a point in the padded occupancy grid
+        return cell_index(pt.x, pt.y, self.stride)
 
-        pygame.draw.rect(self.display, RED, pygame.Rect(self.food.x, self.food.y, BLOCK_SIZE, BLOCK_SIZE))
-        text = font.render("Score: " + str(self.score), True, WHITE)
-        self.display.blit(text, [0, 0])
-        pygame.display.flip()
+    def _update_ui(self):
+        pygame.display.update(self.renderer.draw(self.snake, self.food, self.score))
 
     def _move(self, action):
         clock_wise = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
@@ -122,57 +332,87 @@ class SnakeGameAI:
         self.direction = new_dir
         x = self.head.x
         y = self.head.y
-        if self.direction == Direction.RIGHT: x += BLOCK_SIZE
-        elif self.direction == Direction.LEFT: x -= BLOCK_SIZE
-        elif self.direction == Direction.DOWN: y += BLOCK_SIZE
-        elif self.direction == Direction.UP: y -= BLOCK_SIZE
+        if self.direction == Direction.RIGHT: x += 1
+        elif self.direction == Direction.LEFT: x -= 1
+        elif self.direction == Direction.DOWN: y += 1
+        elif self.direction == Direction.UP: y -= 1
         self.head = Point(x, y)
 
 # --- CLASS 2: VERSUS MODE (Human vs AI) ---
 class SnakeGameVersus:
-    def __init__(self, w=640, h=480):
-        self.w = w
-        self.h = h
+    def __init__(self, cols=32, rows=24, seed=None, block_size=BLOCK_SIZE):
+        self.cols = cols
+        self.rows = rows
+        self.w = cols * block_size
+        self.h = rows * block_size
+        self.rng = random.Random(seed)
         # Screen width is doubled + 20px border
         self.display = pygame.display.set_mode((self.w * 2 + 20, self.h))
         pygame.display.set_caption('Human (Left) vs AI (Right)')
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont('arial', 25)
+        self.renderer1 = BoardRenderer(self.display, cols, rows, "Human: ", self.font, block_size=block_size)
+        self.renderer2 = BoardRenderer(self.display, cols, rows, "AI: ", self.font, (GREEN1, GREEN2),
+                                       offset=self.w + 20, block_size=block_size)
+        self.empty_board = FreeCells(cols, rows)
+        self.stride = grid_stride(cols)
+        self.empty_grid = empty_grid(cols, rows)
         self.reset()
 
     def reset(self):
+        self.renderer1.invalidate()
+        self.renderer2.invalidate()
+
         # --- PLAYER 1 (HUMAN) ---
         self.direction1 = Direction.RIGHT
-        self.head1 = Point(self.w / 2, self.h / 2)
-        self.snake1 = [self.head1, Point(self.head1.x - BLOCK_SIZE, self.head1.y), Point(self.head1.x - (2 * BLOCK_SIZE), self.head1.y)]
+        self.head1 = Point(self.cols // 2, self.rows // 2)
+        self.snake1 = deque([self.head1, Point(self.head1.x - 1, self.head1.y), Point(self.head1.x - 2, self.head1.y)])
+        self.grid1 = self._grid(self.snake1)
+        self.free1 = self._free_cells(self.snake1)
         self.score1 = 0
         self.food1 = None
         self._place_food(1)
         
         # --- PLAYER 2 (AI) ---
         self.direction2 = Direction.RIGHT
-        self.head2 = Point(self.w / 2, self.h / 2)
-        self.snake2 = [self.head2, Point(self.head2.x - BLOCK_SIZE, self.head2.y), Point(self.head2.x - (2 * BLOCK_SIZE), self.head2.y)]
+        self.head2 = Point(self.cols // 2, self.rows // 2)
+        self.snake2 = deque([self.head2, Point(self.head2.x - 1, self.head2.y), Point(self.head2.x - 2, self.head2.y)])
+        self.grid2 = self._grid(self.snake2)
+        self.free2 = self._free_cells(self.snake2)
         self.score2 = 0
         self.food2 = None
         self._place_food(2)
         
+    def cell(self, pt):
+        # Index of a point in a padded occupancy grid
+        return cell_index(pt.x, pt.y, self.stride)
+
+    def _grid(self, snake):
+        grid = bytearray(self.empty_grid)
+        for pt in snake:
+            grid[self.cell(pt)] = 1
+        return grid
+
+    def _free_cells(self, snake):
+        free = self.empty_board.copy()
+        for pt in snake:
+            free.remove(pt)
+        return free
+
     def _place_food(self, player_id):
-        x = random.randint(0, (self.w - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-        y = random.randint(0, (self.h - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-        food = Point(x, y)
+        # Returns False when that player's snake fills the whole board
         if player_id == 1:
-            if food in self.snake1: self._place_food(1)
-            else: self.food1 = food
+            self.food1 = self.free1.sample(self.rng)
+            return self.food1 is not None
         else:
-            if food in self.snake2: self._place_food(2)
-            else: self.food2 = food
+            self.food2 = self.free2.sample(self.rng)
+            return self.food2 is not None
 
     def is_collision_ai(self, pt=None):
         if pt is None: pt = self.head2
-        if pt.x > self.w - BLOCK_SIZE or pt.x < 0 or pt.y > self.h - BLOCK_SIZE or pt.y < 0:
+        if pt.x >= self.cols or pt.x < 0 or pt.y >= self.rows or pt.y < 0:
             return True
-        if pt in self.snake2[1:]:
+        if self.grid2[self.cell(pt)] and pt != self.snake2[0]:
             return True
         return False
 
@@ -196,40 +436,54 @@ class SnakeGameVersus:
         self._move_human()
         self._move_ai(action_ai)
         
-        self.snake1.insert(0, self.head1)
-        self.snake2.insert(0, self.head2)
-        
-        # 3. Game Over & Food Logic
+        # 3. Game Over & Food Logic (collisions checked before the heads go in)
         # Human
         game_over_1 = False
-        if (self.head1.x > self.w - BLOCK_SIZE or self.head1.x < 0 or 
-            self.head1.y > self.h - BLOCK_SIZE or self.head1.y < 0 or 
-            self.head1 in self.snake1[1:]):
+        if (self.head1.x >= self.cols or self.head1.x < 0 or 
+            self.head1.y >= self.rows or self.head1.y < 0 or 
+            self.grid1[self.cell(self.head1)]):
             game_over_1 = True
+        self.snake1.appendleft(self.head1)
+        self.grid1[self.cell(self.head1)] = 1
+        self.free1.remove(self.head1)
             
+        cleared_1 = False
         if self.head1 == self.food1:
             self.score1 += 1
-            self._place_food(1)
+            cleared_1 = not self._place_food(1)
         else:
-            self.snake1.pop()
+            tail = self.snake1.pop()
+            self.grid1[self.cell(tail)] = 0
+            self.free1.add(tail)
 
         # AI
         game_over_2 = False
         if self.is_collision_ai():
             game_over_2 = True
+        self.snake2.appendleft(self.head2)
+        self.grid2[self.cell(self.head2)] = 1
+        self.free2.remove(self.head2)
             
+        cleared_2 = False
         if self.head2 == self.food2:
             self.score2 += 1
-            self._place_food(2)
+            cleared_2 = not self._place_food(2)
         else:
-            self.snake2.pop()
+            tail = self.snake2.pop()
+            self.grid2[self.cell(tail)] = 0
+            self.free2.add(tail)
 
+        # A full board is a win: the score is kept and the snake starts again
         if game_over_1:
             self.score1 = 0
             self._respawn(1)
+        elif cleared_1:
+            self._respawn(1)
         if game_over_2:
             self.score2 = 0
             self._respawn(2)
+        elif cleared_2:
+            self._respawn(2)
             
         # 4. UI
         self._update_ui()
@@ -238,46 +492,37 @@ class SnakeGameVersus:
 
     def _respawn(self, player_id):
         if player_id == 1:
-            self.head1 = Point(self.w / 2, self.h / 2)
-            self.snake1 = [self.head1, Point(self.head1.x-20, self.head1.y), Point(self.head1.x-40, self.head1.y)]
+            self.head1 = Point(self.cols // 2, self.rows // 2)
+            self.snake1 = deque([self.head1, Point(self.head1.x - 1, self.head1.y), Point(self.head1.x - 2, self.head1.y)])
+            self.grid1 = self._grid(self.snake1)
+            self.free1 = self._free_cells(self.snake1)
             self._place_food(1)
         else:
-            self.head2 = Point(self.w / 2, self.h / 2)
-            self.snake2 = [self.head2, Point(self.head2.x-20, self.head2.y), Point(self.head2.x-40, self.head2.y)]
+            self.head2 = Point(self.cols // 2, self.rows // 2)
+            self.snake2 = deque([self.head2, Point(self.head2.x - 1, self.head2.y), Point(self.head2.x - 2, self.head2.y)])
+            self.grid2 = self._grid(self.snake2)
+            self.free2 = self._free_cells(self.snake2)
             self._place_food(2)
 
     def _update_ui(self):
-        self.display.fill(BLACK)
-        
-        # Draw Human (Left)
-        for pt in self.snake1:
-            pygame.draw.rect(self.display, BLUE1, pygame.Rect(pt.x, pt.y, BLOCK_SIZE, BLOCK_SIZE))
-            pygame.draw.rect(self.display, BLUE2, pygame.Rect(pt.x+4, pt.y+4, 12, 12))
-        pygame.draw.rect(self.display, RED, pygame.Rect(self.food1.x, self.food1.y, BLOCK_SIZE, BLOCK_SIZE))
-        
-        # Draw Separator
-        pygame.draw.rect(self.display, WHITE, pygame.Rect(self.w, 0, 20, self.h))
-
-        # Draw AI (Right)
-        OFFSET = self.w + 20
-        for pt in self.snake2:
-            pygame.draw.rect(self.display, GREEN1, pygame.Rect(pt.x + OFFSET, pt.y, BLOCK_SIZE, BLOCK_SIZE))
-            pygame.draw.rect(self.display, GREEN2, pygame.Rect(pt.x + OFFSET+4, pt.y+4, 12, 12))
-        pygame.draw.rect(self.display, RED, pygame.Rect(self.food2.x + OFFSET, self.food2.y, BLOCK_SIZE, BLOCK_SIZE))
-
-        text1 = self.font.render("Human: " + str(self.score1), True, WHITE)
-        text2 = self.font.render("AI: " + str(self.score2), True, WHITE)
-        self.display.blit(text1, [0, 0])
-        self.display.blit(text2, [OFFSET, 0])
-        pygame.display.flip()
+        full = self.renderer1.full
+        # Human (left), AI (right): each board only repaints what changed
+        dirty = self.renderer1.draw(self.snake1, self.food1, self.score1)
+        dirty += self.renderer2.draw(self.snake2, self.food2, self.score2)
+        if full:
+            # Separator
+            pygame.draw.rect(self.display, WHITE, pygame.Rect(self.w, 0, 20, self.h))
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
 
     def _move_human(self):
         x = self.head1.x
         y = self.head1.y
-        if self.direction1 == Direction.RIGHT: x += BLOCK_SIZE
-        elif self.direction1 == Direction.LEFT: x -= BLOCK_SIZE
-        elif self.direction1 == Direction.DOWN: y += BLOCK_SIZE
-        elif self.direction1 == Direction.UP: y -= BLOCK_SIZE
+        if self.direction1 == Direction.RIGHT: x += 1
+        elif self.direction1 == Direction.LEFT: x -= 1
+        elif self.direction1 == Direction.DOWN: y += 1
+        elif self.direction1 == Direction.UP: y -= 1
         self.head1 = Point(x, y)
 
     def _move_ai(self, action):
@@ -296,8 +541,8 @@ class SnakeGameVersus:
         self.direction2 = new_dir
         x = self.head2.x
         y = self.head2.y
-        if self.direction2 == Direction.RIGHT: x += BLOCK_SIZE
-        elif self.direction2 == Direction.LEFT: x -= BLOCK_SIZE
-        elif self.direction2 == Direction.DOWN: y += BLOCK_SIZE
-        elif self.direction2 == Direction.UP: y -= BLOCK_SIZE
+        if self.direction2 == Direction.RIGHT: x += 1
+        elif self.direction2 == Direction.LEFT: x -= 1
+        elif self.direction2 == Direction.DOWN: y += 1
+        elif self.direction2 == Direction.UP: y -= 1
         self.head2 = Point(x, y)
\ No newline at end of file
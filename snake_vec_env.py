@@ -0,0 +1,116 @@
+import numpy as np
+
+from state_encoder import cell_index, empty_grid, encode_states, grid_stride, grid_steps
+
+# Directions in clockwise order, same as SnakeGameAI._move: RIGHT, DOWN, LEFT, UP
+RIGHT, DOWN, LEFT, UP = 0, 1, 2, 3
+
+# --- BATCHED AI ENVIRONMENT: N independent boards stepped together ---
+# Same rules as SnakeGameAI.play_step (collisions, 100*len(snake) timeout,
+# +10/-10 rewards), but every board lives in NumPy arrays:
+#   grid  (N, cells)  padded occupancy grid, walls included (see state_encoder)
+#   body  (N, cols * rows)  ring buffer of body cells, body[i, head_ptr[i]] is the head
+class SnakeGameVec:
+
+    def __init__(self, n_envs, cols=32, rows=24, seed=None):
+        self.n_envs = n_envs
+        self.cols = cols
+        self.rows = rows
+        self.n_cells = self.cols * self.rows
+        self.stride = grid_stride(self.cols)
+        self.steps = np.array(grid_steps(self.stride))
+        self.empty_grid = np.frombuffer(empty_grid(self.cols, self.rows), dtype=bool)
+        self.rng = np.random.default_rng(seed)
+
+        self.grid = np.zeros((n_envs, len(self.empty_grid)), dtype=bool)
+        self.body = np.zeros((n_envs, self.n_cells), dtype=np.int64)
+        self.head_ptr = np.zeros(n_envs, dtype=np.int64)
+        self.length = np.zeros(n_envs, dtype=np.int64)
+        self.head = np.zeros(n_envs, dtype=np.int64)
+        self.direction = np.zeros(n_envs, dtype=np.int64)
+        self.food = np.zeros(n_envs, dtype=np.int64)
+        self.score = np.zeros(n_envs, dtype=np.int64)
+        self.frame_iteration = np.zeros(n_envs, dtype=np.int64)
+        self._envs = np.arange(n_envs)
+        self.reset()
+
+    def reset(self, mask=None):
+        idx = self._envs if mask is None else np.flatnonzero(mask)
+        if len(idx) == 0:
+            return
+
+        x = self.cols // 2
+        y = self.rows // 2
+        start = np.array([cell_index(x - i, y, self.stride) for i in (2, 1, 0)]) # tail ... head
+        self.grid[idx] = self.empty_grid
+        self.grid[idx[:, None], start] = True
+        self.body[idx, :3] = start
+        self.head_ptr[idx] = 2
+        self.length[idx] = 3
+        self.head[idx] = start[-1]
+        self.direction[idx] = RIGHT
+        self.score[idx] = 0
+        self.frame_iteration[idx] = 0
+        self._place_food(idx)
+
+    def _place_food(self, idx):
+        # Uniform over free cells: random keys, occupied cells and walls masked out.
+        # Returns a mask of boards with no free cell left (board full).
+        keys = self.rng.random((len(idx), self.grid.shape[1]))
+        keys[self.grid[idx]] = -1.0
+        cells = keys.argmax(axis=1)
+        self.food[idx] = cells
+        return keys[np.arange(len(idx)), cells] < 0
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        envs = self._envs
+        self.frame_iteration += 1
+
+        # 1. Turn: [1,0,0] straight, [0,1,0] right, anything else left
+        straight = (actions == (1, 0, 0)).all(axis=1)
+        right = (actions == (0, 1, 0)).all(axis=1)
+        turn = np.where(straight, 0, np.where(right, 1, -1))
+        self.direction = (self.direction + turn) % 4
+        cell = self.head + self.steps[self.direction]
+
+        # 2. Game over: wall, any body cell (tail included) or timeout
+        dead = self.grid[envs, cell]
+        dead |= self.frame_iteration > 100 * (self.length + 1)
+
+        # 3. Move the surviving snakes
+        alive = np.flatnonzero(~dead)
+        new = cell[alive]
+        self.head_ptr[alive] = (self.head_ptr[alive] + 1) % self.n_cells
+        self.body[alive, self.head_ptr[alive]] = new
+        self.grid[alive, new] = True
+        self.head[alive] = new
+
+        ate = np.zeros(self.n_envs, dtype=bool)
+        ate[alive] = new == self.food[alive]
+        grow = np.flatnonzero(ate)
+        self.score[grow] += 1
+        self.length[grow] += 1
+
+        moved = np.flatnonzero(~dead & ~ate)
+        tail = self.body[moved, (self.head_ptr[moved] - self.length[moved]) % self.n_cells]
+        self.grid[moved, tail] = False
+
+        won = np.zeros(self.n_envs, dtype=bool)
+        won[grow] = self._place_food(grow)
+
+        rewards = np.zeros(self.n_envs, dtype=np.float32)
+        rewards[ate] = 10
+        rewards[dead] = -10
+        dones = dead | won
+        scores = self.score.copy()
+
+        # 4. Finished boards start over straight away
+        self.reset(dones)
+        return rewards, dones, scores, self.get_states()
+
+    def get_states(self):
+        # Same 11 features, same order as Agent._calculate_state
+        food_dx = self.food % self.stride - self.head % self.stride
+        food_dy = self.food // self.stride - self.head // self.stride
+        return encode_states(self.grid, self.stride, self.head, self.direction, food_dx, food_dy)
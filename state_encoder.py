@@ -0,0 +1,61 @@
+import numpy as np
+
+# --- OCCUPANCY GRID LAYOUT ---
+# Flat, row-major, with a wall border PAD cells wide. A head that just left
+# the board and its neighbours still land inside the grid, so danger checks
+# are plain lookups with no bounds tests. Directions are in clockwise order,
+# as in SnakeGameAI._move: RIGHT, DOWN, LEFT, UP.
+PAD = 2
+
+def grid_stride(cols):
+    return cols + 2 * PAD
+
+def cell_index(x, y, stride):
+    return (y + PAD) * stride + x + PAD
+
+def empty_grid(cols, rows):
+    stride = grid_stride(cols)
+    grid = bytearray([1]) * (stride * (rows + 2 * PAD))
+    for y in range(rows):
+        start = cell_index(0, y, stride)
+        grid[start:start + cols] = bytes(cols)
+    return grid
+
+def grid_steps(stride):
+    return (1, stride, -1, -stride)
+
+# --- STATE ENCODING ---
+# The 11 features, in Agent order, read as bits 10..0 of a code:
+#   danger straight / right / left, dir l / r / u / d, food l / r / u / d
+# Every possible state is precomputed, so encoding is just building the code.
+STATES = ((np.arange(2048)[:, None] >> np.arange(10, -1, -1)) & 1).astype(int)
+DIRECTION_BITS = (1 << 6, 1 << 4, 1 << 7, 1 << 5) # RIGHT, DOWN, LEFT, UP
+CODE_BITS = 1 << np.arange(10, -1, -1)
+
+def state_codes(states):
+    # Inverse of STATES: (N, 11) feature rows -> their codes
+    return np.asarray(states) @ CODE_BITS
+
+def encode_state(grid, stride, head, direction, food_dx, food_dy):
+    # One board: grid is the padded bytearray, head its cell index,
+    # food_dx/food_dy the food position relative to the head
+    steps = grid_steps(stride)
+    code = (grid[head + steps[direction]] << 10
+            | grid[head + steps[(direction + 1) % 4]] << 9
+            | grid[head + steps[(direction - 1) % 4]] << 8
+            | DIRECTION_BITS[direction]
+            | (food_dx < 0) << 3 | (food_dx > 0) << 2
+            | (food_dy < 0) << 1 | (food_dy > 0))
+    return STATES[code].copy()
+
+def encode_states(grids, stride, heads, directions, food_dx, food_dy):
+    # A batch of boards in one call: grids is (N, cells), the rest are (N,) arrays
+    steps = np.array(grid_steps(stride))
+    boards = np.arange(len(heads))
+    code = (grids[boards, heads + steps[directions]].astype(np.int64) << 10
+            | grids[boards, heads + steps[(directions + 1) % 4]].astype(np.int64) << 9
+            | grids[boards, heads + steps[(directions - 1) % 4]].astype(np.int64) << 8
+            | np.array(DIRECTION_BITS)[directions]
+            | (food_dx < 0) << 3 | (food_dx > 0) << 2
+            | (food_dy < 0) << 1 | (food_dy > 0))
+    return STATES[code]